@@ -1,36 +1,484 @@
-from flask import Flask, render_template, request, send_file, jsonify, session
+from flask import Flask, Request, Response, render_template, request, send_file, jsonify, session, stream_with_context
 import os
 import re
-from datetime import datetime
-from docx import Document
-from docx.shared import Inches, Pt, RGBColor
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-from docx.oxml.shared import OxmlElement, qn
-from PIL import Image
+import sys
+import importlib
+from datetime import datetime, timezone
 import tempfile
 import base64
-import weasyprint
-import markdown
-from ebooklib import epub
 import uuid
 import shutil
 import io
-from PyPDF2 import PdfMerger
-import cv2
+import json
+import hashlib
+import struct
+from xml.sax.saxutils import escape as xml_escape
 import zipfile
 import threading
+import queue
+import multiprocessing
+import time
+import itertools
+import bisect
+import functools
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+from contextlib import contextmanager
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from werkzeug.utils import secure_filename
+from markupsafe import Markup
+from html import escape as html_escape
 
 app = Flask(__name__)
 app.secret_key = 'your_secret_key_here'  # Change this in production
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 500 * 1024 * 1024  # 500MB max
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+app.config['CAPTURE_WORKERS'] = 1  # >1 decodes time shards in parallel processes
+app.config['CAPTURE_SHARD_SECONDS'] = None  # None splits the timeline evenly across workers
+app.config['CAPTURE_SHARD_FRAMES'] = 32  # caps frames per shard, so at most workers * 2 * 32 frames wait in memory
+app.config['MAX_CONCURRENT_JOBS'] = 2
+app.config['MAX_QUEUED_JOBS'] = 20
+app.config['JOB_RESULT_TTL'] = 60 * 60  # seconds a finished job's zip is kept for download
+app.config['JOB_PRUNE_INTERVAL'] = 60  # seconds between sweeps for expired job results
+app.config['FRAME_CACHE_FOLDER'] = os.path.join('cache', 'frames')
+app.config['FRAME_CACHE_MAX_BYTES'] = 2 * 1024 * 1024 * 1024  # 0 disables the frame cache
+app.config['REPORT_CACHE_FOLDER'] = os.path.join('cache', 'reports')
+app.config['REPORT_CACHE_MAX_BYTES'] = 5 * 1024 * 1024 * 1024  # 0 disables the report cache
+app.config['REPORT_CACHE_TTL'] = 24 * 60 * 60  # seconds
+app.config['PRELOAD_BACKENDS'] = []  # e.g. ['capture', 'pdf'] to import them when app.py loads, before workers fork
+
+IMAGE_FORMATS = {
+    'png': ('PNG', 'png', 'image/png'),
+    'jpeg': ('JPEG', 'jpg', 'image/jpeg'),
+    'webp': ('WEBP', 'webp', 'image/webp'),
+}
+THUMBNAIL_WIDTH = 320
+DEDUP_GRID_SIZE = 32
+DEDUP_CELL_TOLERANCE = 8  # gray levels a cell may drift before it counts as changed
+EXPORT_FORMATS = ['docx', 'pdf', 'html', 'md', 'epub']
+DOCX_IMAGE_WIDTH_EMU = int(6.5 * 914400)  # 6.5 inches, the width the python-docx writer uses
+DOCX_NAMESPACES = ('xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+                   'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+                   'xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" '
+                   'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+                   'xmlns:pic="http://schemas.openxmlformats.org/drawingml/2006/picture"')
+CUE_BLOCK_HTML = ('<div class="subtitle-block">\n<h2{id_attr}>{heading}</h2>\n'
+                  '<p class="timing"><strong>Time:</strong> {time}</p>\n'
+                  '<div class="text-content"><span class="text-label">Text: </span><span class="subtitle-text">{text}</span></div>\n'
+                  '{image}</div>\n')
+CUE_IMAGE_HTML = '<p class="screenshot-label"><strong>Screenshot:</strong></p>\n<img src="{src}" alt="Screenshot {number}" />\n'
+CUE_THUMBNAIL_HTML = ('<p class="screenshot-label"><strong>Screenshot:</strong></p>\n'
+                      '<a href="{href}"><img src="{src}" alt="Screenshot {number}" loading="lazy" /></a>\n')
+CUE_BLOCK_MARKDOWN = ('## {heading}\n**Time:** {time}\n'
+                      '<span class="text-label">Text: </span><span class="subtitle-text">{text}</span>\n{image}')
+CUE_IMAGE_MARKDOWN = '**Screenshot:**\n![Screenshot {number}]({src})\n'
+PAGE_BREAK_HTML = '<div class="page-break"></div>\n'
+REPORT_BODY_MARKER = Markup('<!--report-body-->')
+# Modules each backend needs, imported the first time the backend is used instead of when
+# app.py loads; WeasyPrint alone pulls in Pango/Cairo, which a Markdown-only worker never needs
+BACKEND_MODULES = {
+    'capture': ('cv2', 'PIL.Image'),
+    'docx': ('docx', 'docx.shared', 'docx.enum.text', 'docx.oxml.shared', 'PIL.Image'),
+    'pdf': ('weasyprint', 'PyPDF2'),
+    'html': (),
+    'md': (),
+    'epub': (),
+}
+EPUB_CONTAINER_XML = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                      '<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">'
+                      '<rootfiles><rootfile full-path="EPUB/content.opf" media-type="application/oebps-package+xml"/></rootfiles>'
+                      '</container>')
+STORED_ZIP_EXTENSIONS = {'png', 'jpg', 'jpeg', 'webp', 'docx', 'epub', 'pdf'}  # already compressed
+
+SUBTITLE_TIMING_RE = re.compile(r'^\s*(?:(\d+):)?(\d{1,2}):(\d{1,2})[,.](\d{1,3})\s*-->\s*(?:(\d+):)?(\d{1,2}):(\d{1,2})[,.](\d{1,3})(?:\s.*)?$')
+WEBVTT_SKIPPED_BLOCKS = ('WEBVTT', 'NOTE', 'STYLE', 'REGION')
+
+class Cue:
+    # Compact subtitle record; item access keeps subtitle['text'] style lookups working
+    __slots__ = ('number', 'start_time', 'end_time', 'text')
+
+    def __init__(self, number, start_time, end_time, text):
+        self.number = number
+        self.start_time = start_time
+        self.end_time = end_time
+        self.text = text
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def __repr__(self):
+        return f"Cue({self.number!r}, {self.start_time!r}, {self.end_time!r}, {self.text!r})"
+
+class CueIndex:
+    # Interval index over parsed cues: start times sorted for bisect plus a running maximum of the
+    # end times, so a window query only visits cues that can overlap it instead of scanning the file
+    def __init__(self, cues):
+        self.cues = cues
+        self.order = sorted(range(len(cues)), key=lambda i: cues[i].start_time)
+        self.starts = [cues[i].start_time for i in self.order]
+        self.max_ends = list(itertools.accumulate((cues[i].end_time for i in self.order), max))
+        numbered = sorted((int(cue.number), i) for i, cue in enumerate(cues) if cue.number.isdigit())
+        self.numbers = [number for number, _ in numbered]
+        self.number_positions = [i for _, i in numbered]
+
+    def overlapping(self, start=None, end=None):
+        # Positions of the cues shown at any point in [start, end]; None leaves that side open
+        lo = 0 if start is None else bisect.bisect_right(self.max_ends, start)
+        hi = len(self.starts) if end is None else bisect.bisect_right(self.starts, end)
+        return [self.order[k] for k in range(lo, hi) if start is None or self.cues[self.order[k]].end_time > start]
+
+    def numbered(self, first=None, last=None):
+        lo = 0 if first is None else bisect.bisect_left(self.numbers, first)
+        hi = len(self.numbers) if last is None else bisect.bisect_right(self.numbers, last)
+        return self.number_positions[lo:hi]
+
+    def select(self, time_ranges=(), cue_ranges=()):
+        # Union of all ranges, in file order so numbering and page layout follow the SRT
+        positions = set()
+        for start, end in time_ranges:
+            positions.update(self.overlapping(start, end))
+        for first, last in cue_ranges:
+            positions.update(self.numbered(first, last))
+        return [self.cues[i] for i in sorted(positions)]
+
+def parse_time_value(text):
+    # Seconds, M:S or H:M:S, with an optional ,/. fraction
+    parts = text.strip().replace(',', '.').split(':')
+    if len(parts) > 3 or not all(parts):
+        raise ValueError(f"Invalid time: {text.strip()}")
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + float(part)
+    if not 0 <= seconds < float('inf'):  # also rejects nan
+        raise ValueError(f"Invalid time: {text.strip()}")
+    return seconds
+
+def parse_cue_number(text):
+    number = int(text)
+    if number < 0:
+        raise ValueError(f"Invalid cue number: {text.strip()}")
+    return number
+
+def parse_ranges(text, parse_value):
+    # "a-b, c, d-" lists; a missing bound leaves that side open and a single value selects just itself
+    ranges = []
+    for part in filter(None, (part.strip() for part in re.split(r'[,;]', text or ''))):
+        first, dash, last = part.partition('-')
+        try:
+            first = parse_value(first) if first.strip() else None
+            last = parse_value(last) if last.strip() else (None if dash else first)
+        except ValueError:
+            raise ValueError(f"Invalid range: {part}")
+        if first is not None and last is not None and last < first:
+            raise ValueError(f"Invalid range: {part} ends before it starts")
+        ranges.append((first, last))
+    return ranges
+
+class ImageAsset:
+    def __init__(self, path, media_type="image/png", thumbnail=None):
+        self.path = path
+        self.filename = os.path.basename(path)
+        self.media_type = media_type
+        self.thumbnail = thumbnail
+
+    def read_bytes(self):
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def data_uri(self):
+        return f"data:{self.media_type};base64,{base64.b64encode(self.read_bytes()).decode('utf-8')}"
+
+class ImageAssetStore:
+    # Screenshots are encoded once into images_dir; every writer references the same files
+    def __init__(self, images_dir):
+        self.images_dir = images_dir
+        os.makedirs(images_dir, exist_ok=True)
+
+    def add(self, filename, data, media_type="image/png", thumbnail=None):
+        path = os.path.join(self.images_dir, filename)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return ImageAsset(path, media_type, thumbnail)
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def peak_rss_bytes():
+    # High-water mark of the whole process, not of any one job; None where it cannot be read.
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def load_backend(name):
+    # Returns the seconds spent importing, 0.0 once the modules are already in sys.modules
+    missing = [module for module in BACKEND_MODULES[name] if module not in sys.modules]
+    if not missing:
+        return 0.0
+    start = time.perf_counter()
+    for module in missing:
+        importlib.import_module(module)
+    return time.perf_counter() - start
+
+def warm_backends(names=None):
+    # Preload hook for the master process of a pre-forking server (gunicorn --preload or its
+    # on_starting hook) so forked workers share the imported modules instead of each loading them
+    for name in names or BACKEND_MODULES:
+        load_backend(name)
+
+def render_template_parts(template_name, **context):
+    # Renders a report template once around REPORT_BODY_MARKER and returns the text before and after it
+    return app.jinja_env.get_template(template_name).render(body=REPORT_BODY_MARKER, **context).split(REPORT_BODY_MARKER)
+
+@functools.lru_cache(maxsize=32)
+def render_stylesheet(template_name, theme_options):
+    # Stylesheets only depend on the theme options, so each combination is rendered once per process
+    return app.jinja_env.get_template(template_name).render(dict(theme_options))
+
+class StageMetrics:
+    # Durations, counts and bytes per processing stage. A per-run instance forwards
+    # everything to the server-wide parent that backs the /metrics endpoint.
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.stages = {}
+        self.process_peak_rss_bytes = None  # the server process's peak seen while stages were recorded
+        self.lock = threading.Lock()
+
+    def add(self, stage, seconds=0.0, count=1, nbytes=0):
+        with self.lock:
+            entry = self.stages.setdefault(stage, {'seconds': 0.0, 'count': 0, 'bytes': 0, 'max_seconds': 0.0})
+            entry['seconds'] += seconds
+            entry['count'] += count
+            entry['bytes'] += nbytes
+            entry['max_seconds'] = max(entry['max_seconds'], seconds)
+            peak = peak_rss_bytes()
+            if peak is not None:
+                self.process_peak_rss_bytes = max(self.process_peak_rss_bytes or 0, peak)
+        if self.parent is not None:
+            self.parent.add(stage, seconds, count, nbytes)
+
+    @contextmanager
+    def time(self, stage, count=1):
+        # The caller may set result['bytes'] / result['count'] inside the block
+        result = {'bytes': 0, 'count': count}
+        start = time.perf_counter()
+        try:
+            yield result
+        finally:
+            self.add(stage, time.perf_counter() - start, result['count'], result['bytes'])
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                'stages': {stage: dict(entry, seconds=round(entry['seconds'], 6), max_seconds=round(entry['max_seconds'], 6))
+                           for stage, entry in self.stages.items()},
+                'process_peak_rss_bytes': self.process_peak_rss_bytes,
+            }
+
+class HashingUploadFile:
+    # Multipart upload target that lands on its final path and is hashed as the bytes arrive
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'w+b')
+        self.sha256 = hashlib.sha256()
+
+    def write(self, data):
+        self.sha256.update(data)
+        return self.file.write(data)
+
+    def hexdigest(self):
+        return self.sha256.hexdigest()
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+class UploadRequest(Request):
+    # Streams file fields straight into a unique per-request directory instead of
+    # Werkzeug's spooled temp file, so uploads are written to disk exactly once
+    upload_dir = None
+    keep_uploads = False
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.upload_dir is None:
+            os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+            self.upload_dir = tempfile.mkdtemp(dir=app.config['UPLOAD_FOLDER'])
+        name = secure_filename(filename or '') or 'upload'
+        path = os.path.join(self.upload_dir, name)
+        if os.path.exists(path):
+            path = os.path.join(self.upload_dir, f"{uuid.uuid4().hex[:8]}_{name}")
+        return HashingUploadFile(path)
+
+app.request_class = UploadRequest
+
+def uploaded_file(file_storage):
+    # Returns (path, sha256) of a file field received through UploadRequest
+    stream = file_storage.stream
+    stream.close()
+    return stream.path, stream.hexdigest()
+
+@app.teardown_request
+def discard_uploads(exc):
+    if request.upload_dir and not request.keep_uploads:
+        shutil.rmtree(request.upload_dir, ignore_errors=True)
+
+class FrameCache:
+    # Content-addressed on-disk cache of encoded screenshots, keyed by video hash, timestamp
+    # and image profile. Least recently used entries are evicted beyond max_bytes.
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.total_bytes = sum(entry.stat().st_size for entry in self.iter_entries())
+
+    def iter_entries(self):
+        for shard in os.scandir(self.cache_dir):
+            if shard.is_dir():
+                yield from (entry for entry in os.scandir(shard.path) if entry.is_file())
+
+    def key(self, video_hash, timestamp, image_profile):
+        profile = json.dumps(image_profile, sort_keys=True)
+        return hashlib.sha256(f"{video_hash}:{timestamp:.3f}:{profile}".encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def contains(self, key):
+        # Misses are counted here; a hit is counted when get() reads the entry
+        if os.path.exists(self.path(key)):
+            return True
+        with self.lock:
+            self.misses += 1
+        return False
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                blob = f.read()
+            os.utime(path)
+        except OSError:
+            with self.lock:
+                self.misses += 1
+            return None
+        with self.lock:
+            self.hits += 1
+        image_length, = struct.unpack_from('<Q', blob)
+        image_data = blob[8:8 + image_length]
+        return image_data, (blob[8 + image_length:] or None)
+
+    def put(self, key, data):
+        image_data, thumbnail_data = data
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(struct.pack('<Q', len(image_data)))
+            f.write(image_data)
+            f.write(thumbnail_data or b'')
+        os.replace(temp_path, path)
+        with self.lock:
+            self.total_bytes += 8 + len(image_data) + len(thumbnail_data or b'')
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+
+    def evict(self):
+        # Trim to 90% of the quota so eviction does not run on every put
+        entries = sorted(self.iter_entries(), key=lambda entry: entry.stat().st_mtime)
+        self.total_bytes = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if self.total_bytes <= self.max_bytes * 0.9:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                self.total_bytes -= size
+            except OSError:
+                pass
+
+    def stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'bytes': self.total_bytes, 'max_bytes': self.max_bytes}
+
+class ReportCache:
+    # Finished reports.zip files keyed by input hashes, normalized options and formats.
+    # Entries expire after ttl seconds; the oldest are evicted beyond max_bytes.
+    def __init__(self, cache_dir, max_bytes, ttl):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, video_hash, srt_hash, options, formats):
+        payload = json.dumps({'video': video_hash, 'srt': srt_hash, 'options': options, 'formats': sorted(formats)},
+                             sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.zip")
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            fresh = time.time() - os.path.getmtime(path) <= self.ttl
+        except OSError:
+            fresh = False
+        with self.lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return path if fresh else None
+
+    def put(self, key, zip_path):
+        path = self.path(key)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        shutil.copyfile(zip_path, temp_path)
+        os.replace(temp_path, path)
+        self.evict()
+        return path
+
+    def evict(self):
+        now = time.time()
+        with self.lock:
+            entries = sorted((entry for entry in os.scandir(self.cache_dir) if entry.name.endswith('.zip')),
+                             key=lambda entry: entry.stat().st_mtime)
+            total_bytes = sum(entry.stat().st_size for entry in entries)
+            for entry in entries:
+                if total_bytes <= self.max_bytes and now - entry.stat().st_mtime <= self.ttl:
+                    continue
+                try:
+                    size = entry.stat().st_size
+                    os.remove(entry.path)
+                    total_bytes -= size
+                except OSError:
+                    pass
+
+    def stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'max_bytes': self.max_bytes, 'ttl': self.ttl}
 
 class SubtitleProcessor:
     def __init__(self, subtitles_per_page=3, no_spacing=True, narrow_borders=True, add_bookmarks=True,
                  heading_style="numbered", dark_theme=False, text_color="#000000", label_color="#FF0000",
-                 page_organization=True, create_folder=True, custom_title="Video Subtitle Report"):
+                 page_organization=True, create_folder=True, custom_title="Video Subtitle Report",
+                 seek_threshold=5.0, capture_workers=1, shard_seconds=None, shard_frames=32, image_width=0, image_format="png",
+                 image_quality=85, thumbnail_width=0, concurrent_formats=False, pdf_chunk_pages=0, pdf_workers=None,
+                 pdf_embed_images=False, frame_cache=None, dedup_similarity=0.0, metrics=None, fast_docx=False,
+                 html_paged=False, html_cues_per_file=0, time_ranges=None, cue_ranges=None):
         self.subtitles_per_page = subtitles_per_page
         self.no_spacing = no_spacing
         self.narrow_borders = narrow_borders
@@ -42,48 +490,100 @@ class SubtitleProcessor:
         self.page_organization = page_organization
         self.create_folder = create_folder
         self.custom_title = custom_title
+        self.seek_threshold = seek_threshold
+        self.capture_workers = capture_workers
+        self.shard_seconds = shard_seconds
+        self.shard_frames = shard_frames
+        self.image_width = image_width
+        self.image_format = image_format if image_format in IMAGE_FORMATS else "png"
+        self.image_quality = image_quality
+        self.thumbnail_width = thumbnail_width
+        self.concurrent_formats = concurrent_formats
+        self.pdf_chunk_pages = pdf_chunk_pages
+        self.pdf_workers = pdf_workers
+        self.pdf_embed_images = pdf_embed_images
+        self.frame_cache = frame_cache
+        self.dedup_similarity = dedup_similarity
+        self.metrics = metrics if metrics is not None else StageMetrics()
+        self.fast_docx = fast_docx
+        self.html_paged = html_paged
+        self.html_cues_per_file = html_cues_per_file  # 0 puts one subtitles_per_page group in each file
+        # (start, end) pairs from parse_ranges; either list limits capture and reports to the matching cues
+        self.time_ranges = list(time_ranges or [])
+        self.cue_ranges = list(cue_ranges or [])
         self.is_processing = False
+        self.format_errors = {}
+        self.progress = {'stage': 'idle', 'completed': 0, 'total': 0}
+
+    def set_progress(self, stage, completed=0, total=0):
+        self.progress = {'stage': stage, 'completed': completed, 'total': total}
 
     def log_message(self, message, log_list):
         timestamp = datetime.now().strftime("%H:%M:%S")
         log_list.append(f"[{timestamp}] {message}")
 
-    def parse_srt_time(self, time_str):
-        time_str = time_str.replace(',', '.')
-        h, m, s = time_str.split(':')
-        return int(h) * 3600 + int(m) * 60 + float(s)
-
     def format_time(self, seconds):
         hours = int(seconds // 3600)
         minutes = int((seconds % 3600) // 60)
         secs = seconds % 60
         return f"{hours:02d}:{minutes:02d}:{secs:06.3f}"
 
+    def parse_cue_block(self, block, line_number, index, log_list):
+        if block[0].startswith(WEBVTT_SKIPPED_BLOCKS) and block[0].split(' ', 1)[0] in WEBVTT_SKIPPED_BLOCKS:
+            return None
+        timing_at = 0 if '-->' in block[0] else 1
+        match = SUBTITLE_TIMING_RE.match(block[timing_at]) if len(block) > timing_at else None
+        if not match:
+            self.log_message(f"Skipping malformed subtitle block at line {line_number}", log_list)
+            return None
+        h1, m1, s1, ms1, h2, m2, s2, ms2 = match.groups()
+        return Cue(block[0].strip() if timing_at else str(index),
+                   int(h1 or 0) * 3600 + int(m1) * 60 + float(f"{s1}.{ms1}"),
+                   int(h2 or 0) * 3600 + int(m2) * 60 + float(f"{s2}.{ms2}"),
+                   '\n'.join(block[timing_at + 1:]))
+
+    def iter_srt_file(self, srt_path, log_list):
+        # Line-driven parser for SRT and WebVTT; cues are yielded as soon as their block ends
+        with open(srt_path, 'r', encoding='utf-8-sig', errors='replace') as file:
+            block, block_line, index = [], 0, 0
+            for line_number, line in enumerate(file, 1):
+                line = line.rstrip()
+                if line:
+                    if not block:
+                        block_line = line_number
+                    block.append(line)
+                    continue
+                if block:
+                    cue = self.parse_cue_block(block, block_line, index + 1, log_list)
+                    block = []
+                    if cue is not None:
+                        index += 1
+                        yield cue
+            if block:
+                cue = self.parse_cue_block(block, block_line, index + 1, log_list)
+                if cue is not None:
+                    yield cue
+
     def parse_srt_file(self, srt_path, log_list):
         subtitles = []
         try:
-            with open(srt_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-            blocks = re.split(r'\n\s*\n', content.strip())
-            for block in blocks:
-                lines = block.strip().split('\n')
-                if len(lines) >= 3:
-                    subtitle_num = lines[0].strip()
-                    timing_line = lines[1].strip()
-                    start_time, end_time = timing_line.split(' --> ')
-                    text = '\n'.join(lines[2:])
-                    subtitles.append({
-                        'number': subtitle_num,
-                        'start_time': self.parse_srt_time(start_time),
-                        'end_time': self.parse_srt_time(end_time),
-                        'text': text
-                    })
+            for cue in self.iter_srt_file(srt_path, log_list):
+                subtitles.append(cue)
             self.log_message(f"Parsed {len(subtitles)} subtitles from {srt_path}", log_list)
         except Exception as e:
             self.log_message(f"Error parsing SRT file {srt_path}: {str(e)}", log_list)
         return subtitles
 
+    def select_cues(self, subtitles, log_list):
+        # Only the selected cues are captured and rendered, so the rest of the run scales with the selection
+        with self.metrics.time('select') as result:
+            selected = CueIndex(subtitles).select(self.time_ranges, self.cue_ranges)
+            result['count'] = len(selected)
+        self.log_message(f"Selected {len(selected)} of {len(subtitles)} subtitles", log_list)
+        return selected
+
     def capture_screenshot(self, video_path, timestamp, log_list):
+        import cv2
         cap = cv2.VideoCapture(video_path)
         cap.set(cv2.CAP_PROP_POS_MSEC, timestamp * 1000)
         ret, frame = cap.read()
@@ -95,6 +595,343 @@ class SubtitleProcessor:
         self.log_message(f"Failed to capture screenshot for timestamp {self.format_time(timestamp)}", log_list)
         return None
 
+    def iter_screenshots(self, video_path, timestamps, log_list):
+        # Decode the video in one forward pass, only converting the frames that are needed.
+        # Gaps larger than seek_threshold seconds are skipped with a seek instead of grab().
+        import cv2
+        order = sorted(range(len(timestamps)), key=lambda i: timestamps[i])
+        cap = cv2.VideoCapture(video_path)
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            position = 0
+            last_target, last_screenshot = None, None
+            for idx in order:
+                if not self.is_processing:
+                    break
+                timestamp = timestamps[idx]
+                screenshot = None
+                if fps <= 0:
+                    cap.set(cv2.CAP_PROP_POS_MSEC, timestamp * 1000)
+                    ret, frame = cap.read()
+                    if ret:
+                        screenshot = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                else:
+                    target = int(timestamp * fps + 0.5)
+                    if target == last_target:
+                        screenshot = last_screenshot
+                    else:
+                        if target < position or (target - position) / fps > self.seek_threshold:
+                            cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+                            position = target
+                        ret = True
+                        while ret and position < target:
+                            ret = cap.grab()
+                            position += 1
+                        if ret and cap.grab():
+                            position += 1
+                            ret, frame = cap.retrieve()
+                            if ret:
+                                screenshot = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                        last_target, last_screenshot = target, screenshot
+                if screenshot is not None:
+                    self.log_message(f"Screenshot captured for timestamp {self.format_time(timestamp)}", log_list)
+                else:
+                    self.log_message(f"Failed to capture screenshot for timestamp {self.format_time(timestamp)}", log_list)
+                yield idx, screenshot
+        finally:
+            cap.release()
+
+    def split_capture_shards(self, timestamps):
+        ordered = sorted(enumerate(timestamps), key=lambda item: item[1])
+        if not ordered:
+            return []
+        shard_seconds = self.shard_seconds
+        if not shard_seconds:
+            shard_seconds = (ordered[-1][1] - ordered[0][1]) / max(self.capture_workers, 1)
+        shards = [[ordered[0]]]
+        shard_start = ordered[0][1]
+        for idx, timestamp in ordered[1:]:
+            # A shard comes back as one result, so its frame count bounds what the parent holds per shard
+            if (shard_seconds > 0 and timestamp - shard_start > shard_seconds) or \
+                    (self.shard_frames and len(shards[-1]) >= self.shard_frames):
+                shards.append([])
+                shard_start = timestamp
+            shards[-1].append((idx, timestamp))
+        return shards
+
+    def iter_screenshots_parallel(self, video_path, timestamps, log_list, encode=False):
+        image_profile = self.image_profile() if encode else None
+        shards = self.split_capture_shards(timestamps)
+        if len(shards) <= 1:
+            # A single shard gains nothing from a worker process
+            frames = self.iter_screenshots(video_path, timestamps, log_list)
+            yield from self.encode_frames(frames) if encode else frames
+            return
+        workers = min(self.capture_workers, len(shards))
+        self.log_message(f"Capturing {len(timestamps)} screenshots in {len(shards)} shards with {workers} workers", log_list)
+        with ProcessPoolExecutor(max_workers=max(workers, 1)) as executor:
+            # Keep only a bounded number of shards in flight so finished frames do not pile up
+            shard_iter = iter(shards)
+            pending = deque(executor.submit(_capture_shard, video_path, shard, self.seek_threshold, image_profile)
+                            for shard in itertools.islice(shard_iter, workers * 2))
+            try:
+                while pending and self.is_processing:
+                    frames, shard_log = pending.popleft().result()
+                    next_shard = next(shard_iter, None)
+                    if next_shard is not None:
+                        pending.append(executor.submit(_capture_shard, video_path, next_shard, self.seek_threshold, image_profile))
+                    log_list.extend(shard_log)
+                    yield from frames
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def capture_screenshots(self, video_path, timestamps, log_list):
+        screenshots = [None] * len(timestamps)
+        if self.capture_workers > 1:
+            frames = self.iter_screenshots_parallel(video_path, timestamps, log_list)
+        else:
+            frames = self.iter_screenshots(video_path, timestamps, log_list)
+        for idx, screenshot in frames:
+            screenshots[idx] = screenshot
+        return screenshots
+
+    def report_options(self, video_path):
+        # Every option that changes the rendered reports, normalized for use in cache keys
+        return {
+            'video_name': os.path.splitext(os.path.basename(video_path))[0],
+            'subtitles_per_page': self.subtitles_per_page,
+            'no_spacing': self.no_spacing,
+            'narrow_borders': self.narrow_borders,
+            'add_bookmarks': self.add_bookmarks,
+            'heading_style': self.heading_style,
+            'dark_theme': self.dark_theme,
+            'text_color': self.text_color.lower(),
+            'label_color': self.label_color.lower(),
+            'page_organization': self.page_organization,
+            'create_folder': self.create_folder,
+            'custom_title': self.custom_title,
+            'pdf_chunk_pages': self.pdf_chunk_pages,
+            'pdf_embed_images': self.pdf_embed_images,
+            'fast_docx': self.fast_docx,
+            'html_paged': self.html_paged,
+            'html_cues_per_file': self.html_cues_per_file,
+            'time_ranges': self.time_ranges,
+            'cue_ranges': self.cue_ranges,
+            'image_profile': self.image_profile(),
+            'dedup_similarity': self.dedup_similarity,
+        }
+
+    def image_profile(self):
+        return {
+            'image_width': self.image_width,
+            'image_format': self.image_format,
+            'image_quality': self.image_quality,
+            'thumbnail_width': self.thumbnail_width,
+        }
+
+    def resize_screenshot(self, screenshot, width):
+        height, current_width = screenshot.shape[:2]
+        if not width or current_width <= width:
+            return screenshot
+        import cv2
+        return cv2.resize(screenshot, (width, max(1, round(height * width / current_width))), interpolation=cv2.INTER_AREA)
+
+    def encode_image(self, screenshot):
+        from PIL import Image
+        pil_format = IMAGE_FORMATS[self.image_format][0]
+        buffer = io.BytesIO()
+        if pil_format == "PNG":
+            Image.fromarray(screenshot).save(buffer, format=pil_format)
+        else:
+            Image.fromarray(screenshot).save(buffer, format=pil_format, quality=self.image_quality)
+        return buffer.getvalue()
+
+    def encode_screenshot(self, screenshot):
+        # Downscale once right after capture; every writer then reuses the encoded bytes
+        with self.metrics.time('encode') as result:
+            screenshot = self.resize_screenshot(screenshot, self.image_width)
+            thumbnail = None
+            if self.thumbnail_width:
+                thumbnail = self.encode_image(self.resize_screenshot(screenshot, self.thumbnail_width))
+            data = self.encode_image(screenshot)
+            result['bytes'] = len(data) + len(thumbnail or b'')
+        return data, thumbnail
+
+    def iter_encoded_screenshots(self, video_path, timestamps, log_list, video_hash=None):
+        # Yields (index, (image, thumbnail)) in timestamp order. Dedup runs last, so the frame cache
+        # only ever stores each timestamp's own frame under its key.
+        if self.frame_cache is None or not video_hash:
+            frames = self.capture_encoded_screenshots(video_path, timestamps, log_list)
+        else:
+            frames = self.iter_cached_screenshots(video_path, timestamps, log_list, video_hash)
+        yield from self.dedup_screenshots(frames) if self.dedup_similarity else frames
+
+    def iter_cached_screenshots(self, video_path, timestamps, log_list, video_hash):
+        # Serve what the frame cache already has; only the misses are decoded from the video and
+        # merged back in, so frames still come out in timestamp order
+        profile = self.image_profile()
+        order = sorted(range(len(timestamps)), key=lambda i: timestamps[i])
+        keys = [self.frame_cache.key(video_hash, timestamp, profile) for timestamp in timestamps]
+        missing = [idx for idx in order if not self.frame_cache.contains(keys[idx])]
+        self.log_message(f"Frame cache: {len(timestamps) - len(missing)} hits, {len(missing)} misses", log_list)
+        captured = self.capture_encoded_screenshots(video_path, [timestamps[idx] for idx in missing], log_list)
+        missing_at = {idx: i for i, idx in enumerate(missing)}
+        ahead = {}  # captures delivered before their turn
+        # Repeated timestamps sit next to each other, so only the last hit is kept for reuse
+        last_key, last_data = None, None
+        for idx in order:
+            if not self.is_processing:
+                return
+            key = keys[idx]
+            if idx in missing_at:
+                i = missing_at[idx]
+                if i not in ahead:
+                    for captured_i, captured_data in captured:
+                        ahead[captured_i] = captured_data
+                        if captured_i == i:
+                            break
+                data = ahead.pop(i, None)
+                if data is not None:
+                    self.frame_cache.put(key, data)
+            else:
+                data = last_data if key == last_key else self.frame_cache.get(key)
+                if data is None:
+                    self.log_message(f"Frame cache entry for {self.format_time(timestamps[idx])} was evicted", log_list)
+            last_key, last_data = key, data
+            yield idx, data
+
+    def capture_encoded_screenshots(self, video_path, timestamps, log_list):
+        if self.capture_workers > 1:
+            yield from self.iter_screenshots_parallel(video_path, timestamps, log_list, encode=True)
+            return
+        yield from self.encode_frames(self.iter_screenshots(video_path, timestamps, log_list))
+
+    def encode_frames(self, frames):
+        # Repeated timestamps hand back the same frame object, which is encoded once
+        last_screenshot, last_data = None, None
+        for idx, screenshot in frames:
+            if screenshot is None:
+                yield idx, None
+                continue
+            if screenshot is not last_screenshot:
+                last_data, last_screenshot = self.encode_screenshot(screenshot), screenshot
+            yield idx, last_data
+
+    def dedup_screenshots(self, frames):
+        # FRAMES arrive in timestamp order; one close enough to the last kept frame reuses its bytes
+        last_frame, last_kept, last_signature = None, None, None
+        for idx, data in frames:
+            if data is None:
+                yield idx, None
+                continue
+            if data is not last_frame:
+                signature = self.frame_signature(data[0])
+                if last_signature is None or self.frame_similarity(signature, last_signature) < self.dedup_similarity:
+                    last_kept, last_signature = data, signature
+                last_frame = data
+            yield idx, last_kept
+
+    def frame_signature(self, image_data):
+        # Grayscale frame averaged down to a DEDUP_GRID_SIZE x DEDUP_GRID_SIZE grid of cells
+        import cv2
+        import numpy
+        gray = cv2.imdecode(numpy.frombuffer(image_data, numpy.uint8), cv2.IMREAD_GRAYSCALE)
+        return cv2.resize(gray, (DEDUP_GRID_SIZE, DEDUP_GRID_SIZE), interpolation=cv2.INTER_AREA).astype('int16')
+
+    def frame_similarity(self, signature_a, signature_b):
+        # Fraction of grid cells that did not change; averaging inside each cell absorbs
+        # compression noise while a new line of slide text still changes a few cells
+        return float((abs(signature_a - signature_b) <= DEDUP_CELL_TOLERANCE).mean())
+
+    def store_screenshots(self, video_path, timestamps, store, log_list, video_hash=None):
+        assets = [None] * len(timestamps)
+        for idx, asset in self.iter_stored_screenshots(video_path, timestamps, store, log_list, video_hash):
+            assets[idx] = asset
+        return assets
+
+    def iter_stored_screenshots(self, video_path, timestamps, store, log_list, video_hash=None):
+        # Each frame is encoded once and written to the asset store as soon as it is captured,
+        # so only the compressed files (not the decoded frames) outlive the capture loop.
+        # Yields (index, asset) in capture order, which follows the timestamps, not the indexes.
+        stored = 0
+        _, extension, media_type = IMAGE_FORMATS[self.image_format]
+        last_data, last_asset = None, None
+        assets_by_digest = {}
+        frame_start = time.perf_counter()
+        for idx, data in self.iter_encoded_screenshots(video_path, timestamps, log_list, video_hash):
+            # Time per delivered frame: decode plus encode, or a frame cache read
+            self.metrics.add('capture', time.perf_counter() - frame_start)
+            self.progress['completed'] += 1
+            if data is None:
+                yield idx, None
+                frame_start = time.perf_counter()
+                continue
+            if data is not last_data:
+                image_data, thumbnail_data = data
+                digest = hashlib.sha1(image_data).digest()
+                last_data = data
+                last_asset = assets_by_digest.get(digest)
+                if last_asset is None:
+                    with self.metrics.time('store') as result:
+                        thumbnail = None
+                        if thumbnail_data is not None:
+                            thumbnail = store.add(f'thumbnail_{idx}.{extension}', thumbnail_data, media_type)
+                        last_asset = store.add(f'screenshot_{idx}.{extension}', image_data, media_type, thumbnail)
+                        result['bytes'] = len(image_data) + len(thumbnail_data or b'')
+                    assets_by_digest[digest] = last_asset
+            stored += 1
+            yield idx, last_asset
+            frame_start = time.perf_counter()
+        if stored > len(assets_by_digest):
+            self.log_message(f"Reused {stored - len(assets_by_digest)} duplicate screenshots; "
+                             f"{len(assets_by_digest)} unique images stored", log_list)
+
+    def theme_options(self):
+        # Hashable key for render_stylesheet
+        return (('dark_theme', self.dark_theme), ('label_color', self.label_color), ('narrow_borders', self.narrow_borders),
+                ('no_spacing', self.no_spacing), ('text_color', self.text_color))
+
+    def report_context(self, total):
+        return {
+            'title': self.custom_title or 'Video Subtitle Report',
+            'total': total,
+            'generated_on': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'dark_theme': self.dark_theme,
+            'page_organization': self.page_organization,
+        }
+
+    def cue_renderer(self, fragment, image_src, bookmarks=False, thumbnails=False):
+        # Returns the function that renders one subtitle with the precompiled HTML or Markdown
+        # fragment every writer shares; the per-cue lookups are bound once up front. With
+        # thumbnails the HTML shows a lazily loaded thumbnail linking to the full screenshot.
+        format_time = self.format_time
+        heading_text = self.get_heading_text
+        markdown = fragment == 'md'
+        block, image_block = (CUE_BLOCK_MARKDOWN, CUE_IMAGE_MARKDOWN) if markdown else (CUE_BLOCK_HTML, CUE_IMAGE_HTML)
+        if thumbnails and not markdown:
+            image_block = CUE_THUMBNAIL_HTML
+
+        def render(subtitle, index, screenshot):
+            text, heading, id_attr, image = subtitle['text'], heading_text(subtitle, index), '', ''
+            if screenshot is not None:
+                src = image_src(screenshot)
+                if markdown:
+                    image = image_block.format(src=src, number=index + 1)
+                elif thumbnails:
+                    image = image_block.format(src=html_escape(image_src(screenshot.thumbnail or screenshot)), href=html_escape(src),
+                                               number=index + 1)
+                else:
+                    image = image_block.format(src=html_escape(src), number=index + 1)
+            if not markdown:
+                text = html_escape(text, False).replace('\n', '<br/>')
+                heading = html_escape(heading, False)
+                if bookmarks:
+                    id_attr = f' id="subtitle_{html_escape(subtitle["number"])}"'
+            return block.format(id_attr=id_attr, heading=heading, text=text, image=image,
+                                time=f"{format_time(subtitle['start_time'])} → {format_time(subtitle['end_time'])}")
+        return render
+
     def get_heading_text(self, subtitle, index):
         if self.heading_style == "numbered":
             return f"Subtitle {subtitle['number']}"
@@ -121,17 +958,631 @@ class SubtitleProcessor:
         new_output_path = os.path.join(folder_path, os.path.basename(output_path))
         return new_output_path, images_folder
 
-    def create_docx_report(self, subtitles, screenshots, output_path, relative_path, video_name, base_output_dir, log_list):
-        output_path, images_folder = self.create_output_folder(output_path, relative_path, base_output_dir)
+    def docx_styles_xml(self):
+        # The few styles every paragraph and run of the fast writer refers to
+        text_color = 'FFFFFF' if self.dark_theme else self.text_color.lstrip('#').upper()
+        label_color = self.label_color.lstrip('#').upper()
+        return f'''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:styles {DOCX_NAMESPACES}>
+<w:docDefaults><w:rPrDefault><w:rPr><w:rFonts w:ascii="Calibri" w:hAnsi="Calibri" w:eastAsia="Calibri" w:cs="Calibri"/><w:sz w:val="22"/></w:rPr></w:rPrDefault>
+<w:pPrDefault><w:pPr><w:spacing w:before="0" w:after="0" w:line="240" w:lineRule="auto"/></w:pPr></w:pPrDefault></w:docDefaults>
+<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/><w:qFormat/><w:rPr><w:color w:val="{text_color}"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Title"><w:name w:val="Title"/><w:basedOn w:val="Normal"/><w:next w:val="Normal"/><w:qFormat/><w:pPr><w:jc w:val="center"/></w:pPr><w:rPr><w:sz w:val="56"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Heading2"><w:name w:val="heading 2"/><w:basedOn w:val="Normal"/><w:next w:val="Normal"/><w:qFormat/><w:pPr><w:keepNext/><w:outlineLvl w:val="1"/></w:pPr><w:rPr><w:b/><w:sz w:val="28"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="SubtitleBody"><w:name w:val="Subtitle Body"/><w:basedOn w:val="Normal"/><w:qFormat/><w:rPr><w:sz w:val="20"/></w:rPr></w:style>
+<w:style w:type="character" w:styleId="Label"><w:name w:val="Label"/><w:rPr><w:b/></w:rPr></w:style>
+<w:style w:type="character" w:styleId="TextLabel"><w:name w:val="Text Label"/><w:basedOn w:val="Label"/><w:rPr><w:b/><w:color w:val="{label_color}"/></w:rPr></w:style>
+</w:styles>'''
+
+    def docx_paragraph(self, style, runs, extra=''):
+        # runs are (character style or None, text); newlines in text become line breaks
+        parts = []
+        for run_style, text in runs:
+            run_pr = f'<w:rPr><w:rStyle w:val="{run_style}"/></w:rPr>' if run_style else ''
+            lines = '<w:br/>'.join(f'<w:t xml:space="preserve">{xml_escape(line)}</w:t>' for line in text.split('\n'))
+            parts.append(f'<w:r>{run_pr}{lines}</w:r>')
+        return f'<w:p><w:pPr><w:pStyle w:val="{style}"/></w:pPr>{extra}{"".join(parts)}</w:p>'
+
+    def docx_picture(self, rel_id, picture_id, name, size):
+        width, height = size
+        cx = DOCX_IMAGE_WIDTH_EMU
+        cy = int(cx * height / width)
+        return (f'<w:p><w:pPr><w:pStyle w:val="SubtitleBody"/></w:pPr><w:r><w:drawing>'
+                f'<wp:inline distT="0" distB="0" distL="0" distR="0"><wp:extent cx="{cx}" cy="{cy}"/>'
+                f'<wp:docPr id="{picture_id}" name="Picture {picture_id}"/>'
+                f'<wp:cNvGraphicFramePr><a:graphicFrameLocks noChangeAspect="1"/></wp:cNvGraphicFramePr>'
+                f'<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/picture"><pic:pic>'
+                f'<pic:nvPicPr><pic:cNvPr id="{picture_id}" name="{xml_escape(name)}"/><pic:cNvPicPr/></pic:nvPicPr>'
+                f'<pic:blipFill><a:blip r:embed="{rel_id}"/><a:stretch><a:fillRect/></a:stretch></pic:blipFill>'
+                f'<pic:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+                f'<a:prstGeom prst="rect"><a:avLst/></a:prstGeom></pic:spPr>'
+                f'</pic:pic></a:graphicData></a:graphic></wp:inline></w:drawing></w:r></w:p>')
+
+    def pdf_stylesheet(self):
+        return render_stylesheet('reports/pdf.css', self.theme_options())
+
+    def load_backends(self, names, log_list):
+        # Imports each backend's libraries on first use. Returns an error per backend that could
+        # not be loaded (e.g. WeasyPrint without Pango) so only that format fails.
+        errors = {}
+        for name in names:
+            try:
+                seconds = load_backend(name)
+            except Exception as e:
+                errors[name] = f"{name.upper()} backend unavailable: {str(e)}"
+                continue
+            if seconds:
+                self.metrics.add(f'import_{name}', seconds)
+                self.log_message(f"Loaded {name.upper()} backend in {seconds:.2f}s", log_list)
+        return errors
+
+    def create_writer(self, format_name, output_path, video_name, base_output_dir, log_list, relative_path=""):
+        writer_class = REPORT_WRITERS.get(format_name)
+        if format_name == 'docx' and self.fast_docx:
+            writer_class = FastDocxReportWriter
+        elif format_name == 'html' and self.html_paged:
+            writer_class = PagedHtmlReportWriter
+        if writer_class is None:
+            raise ValueError(f"Unknown export format: {format_name}")
+        if format_name in PROCESS_WRITER_FORMATS and self.concurrent_formats:
+            return ProcessReportWriter(writer_class, self, output_path, video_name, base_output_dir, log_list, relative_path)
+        return writer_class(self, output_path, video_name, base_output_dir, log_list, relative_path)
+
+    def __getstate__(self):
+        # Writer worker processes get a copy without the server-wide metrics and frame cache
+        state = self.__dict__.copy()
+        state['metrics'] = None
+        state['frame_cache'] = None
+        return state
+
+    def render_format(self, format_name, subtitles, screenshots, output_path, video_name, base_output_dir, log_list,
+                      relative_path=""):
+        # Runs one writer over screenshots that were all captured beforehand
+        writer = self.create_writer(format_name, output_path, video_name, base_output_dir, log_list, relative_path)
+        writer.begin(subtitles)
+        try:
+            for cue, screenshot in zip(subtitles, screenshots):
+                if not self.is_processing:
+                    break
+                writer.add_cue(cue, screenshot)
+        except Exception:
+            writer.abort()
+            raise
+        return writer.finish()
+
+    def process_video(self, video_path, srt_path, base_output_dir, log_list, formats=EXPORT_FORMATS, video_hash=None,
+                      output_callback=None, relative_path="", output_name=None):
+        # output_name replaces the video's stem in output folder and report names
+        if not self.is_processing:
+            return []
+        spool_dir = None
+        try:
+            if not os.path.exists(video_path):
+                self.log_message(f"Skipping {video_path}: Video file not found", log_list)
+                return []
+            if not os.path.exists(srt_path):
+                self.log_message(f"Skipping {srt_path}: SRT file not found", log_list)
+                return []
+            video_name = output_name or os.path.splitext(os.path.basename(video_path))[0]
+            self.log_message(f"Processing video: {video_name}", log_list)
+            self.log_message(f"Document title: {self.custom_title or 'Video Subtitle Report'}", log_list)
+            self.set_progress('parsing')
+            with self.metrics.time('parse') as result:
+                subtitles = self.parse_srt_file(srt_path, log_list)
+                result['count'], result['bytes'] = len(subtitles), os.path.getsize(srt_path)
+            if not subtitles:
+                self.log_message(f"No subtitles found in {srt_path}", log_list)
+                return []
+            if self.time_ranges or self.cue_ranges:
+                subtitles = self.select_cues(subtitles, log_list)
+                if not subtitles:
+                    self.log_message("No subtitles in the selected ranges", log_list)
+                    return []
+            # relative_path mirrors the video's location below a batch input directory
+            os.makedirs(os.path.join(base_output_dir, relative_path), exist_ok=True)
+            _, images_folder = self.create_output_folder(os.path.join(base_output_dir, relative_path, f"{video_name}_subtitles"),
+                                                         relative_path, base_output_dir)
+            if not images_folder:
+                spool_dir = tempfile.mkdtemp()
+            store = ImageAssetStore(images_folder or spool_dir)
+            capture_errors = self.load_backends(['capture'], log_list)
+            if capture_errors:
+                raise RuntimeError(capture_errors['capture'])
+            formats = [format_name for format_name in EXPORT_FORMATS if format_name in formats]
+            self.format_errors = self.load_backends(formats, log_list)
+            for format_name, error in self.format_errors.items():
+                self.log_message(f"Failed to create {format_name.upper()} report: {error}", log_list)
+            # Writers start before capture and receive each cue as soon as its screenshot is stored
+            writers = {}
+            for format_name in formats:
+                if format_name in self.format_errors:
+                    continue
+                self.log_message(f"Creating {format_name.upper()} report...", log_list)
+                output_path = os.path.join(base_output_dir, relative_path, f"{video_name}_subtitles.{format_name}")
+                try:
+                    writer = self.create_writer(format_name, output_path, video_name, base_output_dir, log_list, relative_path)
+                    writer.begin(subtitles)
+                    writers[format_name] = writer
+                except Exception as e:
+                    self.format_errors[format_name] = str(e)
+                    self.log_message(f"Failed to create {format_name.upper()} report: {str(e)}", log_list)
+            if not writers:
+                # Nothing would consume the screenshots, so do not open the video at all
+                raise RuntimeError("; ".join(f"{name.upper()}: {error}" for name, error in self.format_errors.items())
+                                   or "No export formats selected")
+            # One feed thread per format renders them concurrently; otherwise a single thread runs them in turn
+            groups = [[item] for item in writers.items()] if self.concurrent_formats else [list(writers.items())]
+            feeds = [WriterFeed(self, group, log_list, output_callback) for group in groups if group]
+            finished = False
+            try:
+                self.set_progress('capturing', 0, len(subtitles))
+                if self.frame_cache is not None and not video_hash:
+                    video_hash = file_sha256(video_path)
+                # Captures are delivered in timestamp order; the writers need them in subtitle order
+                ready, next_idx = {}, 0
+                for idx, asset in self.iter_stored_screenshots(video_path, [subtitle['end_time'] for subtitle in subtitles],
+                                                               store, log_list, video_hash):
+                    ready[idx] = asset
+                    while next_idx in ready:
+                        asset = ready.pop(next_idx)
+                        for feed in feeds:
+                            feed.add_cue(subtitles[next_idx], asset)
+                        next_idx += 1
+                self.set_progress('rendering', 0, len(writers))
+                finished = self.is_processing
+            finally:
+                for feed in feeds:
+                    feed.close(finished)
+                for feed in feeds:
+                    feed.thread.join()
+            for feed in feeds:
+                self.format_errors.update(feed.errors)
+            output_files = [feed.outputs[format_name] for format_name in formats for feed in feeds if format_name in feed.outputs]
+            if self.format_errors and not output_files:
+                raise RuntimeError("; ".join(f"{name.upper()}: {error}" for name, error in self.format_errors.items()))
+            self.progress['stage'] = 'done'
+            return output_files
+        except Exception as e:
+            error_msg = f"Error processing {video_path}: {str(e)}"
+            self.log_message(error_msg, log_list)
+            raise
+        finally:
+            if spool_dir:
+                shutil.rmtree(spool_dir, ignore_errors=True)
+
+REPORT_WRITERS = {}
+
+def register_writer(name, modules=()):
+    # Class decorator that makes a ReportWriter subclass available as export format NAME;
+    # MODULES are the libraries it needs, imported the first time the format is requested
+    def register(writer_class):
+        writer_class.format_name = name
+        REPORT_WRITERS[name] = writer_class
+        BACKEND_MODULES.setdefault(name, tuple(modules))
+        if name not in EXPORT_FORMATS:
+            EXPORT_FORMATS.append(name)
+        return writer_class
+    return register
+
+class ReportWriter:
+    # One export format. process_video calls begin() with the parsed subtitles, add_cue() for
+    # every subtitle in order as soon as its screenshot is stored (None when the frame could not
+    # be captured) and finally finish(), which returns the report's path. abort() releases
+    # whatever begin() opened when the run is cancelled or fails.
+    format_name = None
+    label = None
+
+    def __init__(self, processor, output_path, video_name, base_output_dir, log_list, relative_path=""):
+        self.processor = processor
+        self.video_name = video_name
+        self.log_list = log_list
+        self.output_path, self.images_folder = processor.create_output_folder(output_path, relative_path, base_output_dir)
+        self.total = 0
+        self.count = 0
+
+    def begin(self, subtitles):
+        self.total = len(subtitles)
+
+    def add_cue(self, cue, image_asset):
+        raise NotImplementedError
+
+    def finish(self):
+        return self.output_path
+
+    def close(self):
+        # Releases whatever begin() opened; finish() ends with it and so does abort()
+        pass
+
+    def abort(self):
+        # A failed or cancelled format must not leave a truncated file behind for the zip
+        try:
+            self.close()
+        finally:
+            try:
+                os.remove(self.output_path)
+            except OSError:
+                pass
+
+    def log_saved(self, images=False):
+        self.processor.log_message(f"{self.label or self.format_name.upper()} saved to: {self.output_path}", self.log_list)
+        if images and self.images_folder:
+            self.processor.log_message(f"Images saved to: {self.images_folder}", self.log_list)
+
+class PagedReportWriter(ReportWriter):
+    # Groups the incoming cues into report pages of subtitles_per_page and hands each
+    # complete page to write_page()
+    def begin(self, subtitles):
+        super().begin(subtitles)
+        self.page = []
+        self.page_size = self.processor.subtitles_per_page
+
+    def add_cue(self, cue, image_asset):
+        self.page.append((cue, image_asset))
+        self.count += 1
+        if len(self.page) == self.page_size or self.count == self.total:
+            self.flush_page()
+
+    def flush_page(self):
+        if not self.page:
+            return
+        offset = self.count - len(self.page)
+        self.write_page({
+            'index': offset // self.page_size,
+            'first': offset == 0,
+            'last': self.count >= self.total,
+            'cues': self.page,
+            'offset': offset,
+        })
+        self.page = []
+
+    def write_page(self, page):
+        raise NotImplementedError
+
+    def page_blocks(self, page):
+        return ''.join([self.render(cue, page['offset'] + i, image_asset) for i, (cue, image_asset) in enumerate(page['cues'])])
+
+class TemplateReportWriter(PagedReportWriter):
+    # Renders template_name once around its body marker, then streams each page's cue blocks
+    # into the file in between, so the document never exists as one string
+    template_name = None
+    fragment = 'html'
+    page_break = ''
+    separator = ''
+    separator_after_last = False
+    thumbnails = False
+
+    def begin(self, subtitles):
+        super().begin(subtitles)
+        self.render = self.processor.cue_renderer(self.fragment, self.image_src, self.bookmarks(), self.thumbnails)
+        self.context = self.template_context(subtitles)
+        self.file = None
+        self.begin_document()
+
+    def bookmarks(self):
+        return False
+
+    def image_src(self, screenshot):
+        return f"images/{screenshot.filename}" if self.images_folder else screenshot.filename
+
+    def template_context(self, subtitles):
+        return self.processor.report_context(len(subtitles))
+
+    def begin_document(self):
+        self.open_document(self.output_path)
+
+    def open_document(self, path, **context):
+        head, self.tail = render_template_parts(self.template_name, **dict(self.context, **context))
+        self.file = open(path, 'w', encoding='utf-8')
+        self.file.write(head)
+        self.file_pages = 0
+
+    def close_document(self):
+        self.file.write(self.tail)
+        self.file.close()
+
+    def write_page(self, page):
+        if self.page_break and self.file_pages:
+            self.file.write(self.page_break)
+        self.file.write(self.page_blocks(page))
+        if self.separator and (self.separator_after_last or not page['last']):
+            self.file.write(self.separator)
+        self.file_pages += 1
+
+    def finish(self):
+        self.flush_page()
+        self.close_document()
+        self.log_saved(images=True)
+        return self.output_path
+
+    def close(self):
+        if getattr(self, 'file', None) is not None:
+            self.file.close()
+
+@register_writer('md')
+class MarkdownReportWriter(TemplateReportWriter):
+    label = 'Markdown'
+    template_name = 'reports/report.md'
+    fragment = 'md'
+    separator_after_last = True
+
+    def begin(self, subtitles):
+        if self.processor.page_organization:
+            self.page_break = PAGE_BREAK_HTML
+        else:
+            self.separator = '---\n'
+        super().begin(subtitles)
+
+@register_writer('html')
+class HtmlReportWriter(TemplateReportWriter):
+    label = 'HTML'
+    template_name = 'reports/report.html'
+
+    def begin(self, subtitles):
+        if self.processor.page_organization:
+            self.page_break = PAGE_BREAK_HTML
+        else:
+            self.separator = f'<div class="separator">{"─" * 41}</div>\n'
+        super().begin(subtitles)
+
+    def bookmarks(self):
+        return self.processor.add_bookmarks
+
+    def template_context(self, subtitles):
+        processor = self.processor
+        nav = None
+        if processor.add_bookmarks:
+            nav = Markup(''.join(f'<li><a href="#subtitle_{html_escape(subtitle["number"])}">{html_escape(processor.get_heading_text(subtitle, i), False)}</a></li>\n'
+                                 for i, subtitle in enumerate(subtitles)))
+        return dict(super().template_context(subtitles), nav=nav,
+                    stylesheet=render_stylesheet('reports/report.css', processor.theme_options()))
+
+class PagedHtmlReportWriter(TemplateReportWriter):
+    # Used for 'html' when html_paged is set: every html_cues_per_file cues (default one
+    # subtitles_per_page group) become a small page in <report>_pages/ with prev/next links,
+    # sharing one stylesheet file, and the report path itself holds a compact page index.
+    label = 'HTML'
+    template_name = 'reports/html_page.html'
+    thumbnails = True
+
+    def begin(self, subtitles):
+        self.pages = []
+        super().begin(subtitles)
+        self.page_size = self.processor.html_cues_per_file or self.processor.subtitles_per_page
+        self.page_count = (len(subtitles) + self.page_size - 1) // self.page_size
+
+    def bookmarks(self):
+        return self.processor.add_bookmarks
+
+    def image_src(self, screenshot):
+        return '../' + super().image_src(screenshot)
+
+    def begin_document(self):
+        self.pages_name = f"{os.path.splitext(os.path.basename(self.output_path))[0]}_pages"
+        self.pages_dir = os.path.join(os.path.dirname(self.output_path), self.pages_name)
+        os.makedirs(self.pages_dir, exist_ok=True)
+        with open(os.path.join(self.pages_dir, 'report.css'), 'w', encoding='utf-8') as f:
+            f.write(render_stylesheet('reports/report.css', self.processor.theme_options()))
+
+    def page_filename(self, index):
+        return f"page_{index + 1:04d}.html" if 0 <= index < self.page_count else None
+
+    def write_page(self, page):
+        processor = self.processor
+        index = page['index']
+        filename = self.page_filename(index)
+        first, last = page['cues'][0][0], page['cues'][-1][0]
+        label = processor.get_heading_text(first, page['offset'])
+        if len(page['cues']) > 1:
+            label = f"{label} – {processor.get_heading_text(last, page['offset'] + len(page['cues']) - 1)}"
+        self.open_document(os.path.join(self.pages_dir, filename), page_label=label, page_number=index + 1,
+                           page_count=self.page_count, index_href=f"../{os.path.basename(self.output_path)}",
+                           prev_href=self.page_filename(index - 1), next_href=self.page_filename(index + 1))
+        self.file.write(self.page_blocks(page))
+        self.close_document()
+        self.file = None
+        self.pages.append({
+            'href': f"{self.pages_name}/{filename}",
+            'label': label,
+            'time': f"{processor.format_time(first['start_time'])} → {processor.format_time(last['end_time'])}",
+        })
+
+    def finish(self):
+        self.flush_page()
+        index_html = app.jinja_env.get_template('reports/html_index.html').render(
+            pages=self.pages, stylesheet_href=f"{self.pages_name}/report.css", **self.context)
+        with open(self.output_path, 'w', encoding='utf-8') as f:
+            f.write(index_html)
+        self.log_saved(images=True)
+        self.processor.log_message(f"{len(self.pages)} HTML pages saved to: {self.pages_dir}", self.log_list)
+        return self.output_path
+
+    def abort(self):
+        try:
+            super().abort()
+        finally:
+            if getattr(self, 'pages_dir', None):
+                shutil.rmtree(self.pages_dir, ignore_errors=True)
+
+@register_writer('pdf')
+class PdfReportWriter(TemplateReportWriter):
+    # The print HTML goes to a temp file and WeasyPrint converts it in finish(). With
+    # pdf_chunk_pages set, every chunk of pages is handed to a worker process as soon as its
+    # cues have arrived, so most of the PDF is rendered while capture is still running.
+    label = 'PDF'
+    template_name = 'reports/pdf.html'
+    page_break = PAGE_BREAK_HTML
+
+    def begin(self, subtitles):
+        processor = self.processor
+        self.temp_dir = tempfile.mkdtemp()
+        self.images_dir = None
+        self.pdf_css = processor.pdf_stylesheet()
+        self.chunked = bool(processor.pdf_chunk_pages) and len(subtitles) > processor.pdf_chunk_pages * processor.subtitles_per_page
+        self.executor = None
+        if self.chunked or processor.concurrent_formats:
+            # With concurrent_formats WeasyPrint runs in its own process rather than holding the GIL against the other writers
+            self.executor = ProcessPoolExecutor(max_workers=processor.pdf_workers if self.chunked else 1)
+        self.chunks = []
+        super().begin(subtitles)
+
+    def template_context(self, subtitles):
+        return dict(super().template_context(subtitles), show_info=True)
+
+    def image_src(self, screenshot):
+        if self.processor.pdf_embed_images:
+            return screenshot.data_uri()
+        # <img src> points at the stored screenshot files, which WeasyPrint resolves against base_url
+        if self.images_dir is None:
+            self.images_dir = os.path.dirname(screenshot.path)
+        return os.path.relpath(screenshot.path, self.images_dir).replace(os.sep, '/')
+
+    def open_document(self, path, **context):
+        self.html_path = path
+        super().open_document(path, **context)
+
+    def begin_document(self):
+        html_path = os.path.join(self.temp_dir, f"chunk_{len(self.chunks)}.html")
+        self.open_document(html_path, show_info=not self.chunks)
+
+    def close_document(self):
+        super().close_document()
+        base_url = self.images_dir or self.images_folder or self.temp_dir
+        if not self.chunked:
+            self.chunks.append((self.html_path, base_url))
+            return
+        pdf_path = os.path.join(self.temp_dir, f"chunk_{len(self.chunks)}.pdf")
+        self.chunks.append((pdf_path, self.executor.submit(_render_pdf_chunk, self.html_path, pdf_path, self.pdf_css, base_url)))
+
+    def write_page(self, page):
+        if self.file is None:
+            self.begin_document()
+        super().write_page(page)
+        if self.chunked and self.file_pages == self.processor.pdf_chunk_pages and not page['last']:
+            self.close_document()
+            self.file = None
+
+    def finish(self):
+        try:
+            self.flush_page()
+            if self.file is not None:
+                self.close_document()
+            if self.chunked:
+                self.merge_chunks()
+            else:
+                html_path, base_url = self.chunks[0]
+                if self.executor is not None:
+                    self.executor.submit(_render_pdf_chunk, html_path, self.output_path, self.pdf_css, base_url).result()
+                else:
+                    _render_pdf_chunk(html_path, self.output_path, self.pdf_css, base_url)
+            self.log_saved()
+            return self.output_path
+        except Exception as e:
+            self.processor.log_message(f"PDF conversion error: {str(e)}", self.log_list)
+            raise
+        finally:
+            self.close()
+
+    def merge_chunks(self):
+        # Chunks are merged in order; each keeps the outline entries WeasyPrint generated for its headings
+        for _, future in self.chunks:
+            future.result()
+        from PyPDF2 import PdfMerger
+        merger = PdfMerger()
+        try:
+            for pdf_path, _ in self.chunks:
+                merger.append(pdf_path, import_outline=True)
+            merger.write(self.output_path)
+        finally:
+            merger.close()
+        self.processor.log_message(f"Merged {len(self.chunks)} PDF chunks", self.log_list)
+
+    def close(self):
+        super().close()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+@register_writer('epub')
+class EpubReportWriter(PagedReportWriter):
+    # Writes the EPUB container directly: every image is copied into the archive from the asset
+    # store when its cue arrives and every page is written as a chapter as soon as it is complete,
+    # so no image bytes are held in memory. finish() adds the package document and an NCX/nav
+    # with one entry per subtitle from the headings collected along the way.
+    label = 'EPUB'
+
+    def begin(self, subtitles):
+        super().begin(subtitles)
+        processor = self.processor
+        self.render = processor.cue_renderer('html', lambda screenshot: f"images/{screenshot.filename}", bookmarks=True)
+        self.context = processor.report_context(len(subtitles))
+        self.identifier = f"urn:uuid:{uuid.uuid4()}"
+        self.chapter_template = app.jinja_env.get_template('reports/epub_chapter.html')
+        self.chapters = []
+        self.images = {}
+        self.toc = []
+        self.package = zipfile.ZipFile(self.output_path, 'w', zipfile.ZIP_DEFLATED)
+        # The mimetype entry has to come first and be stored uncompressed
+        self.package.writestr('mimetype', 'application/epub+zip', zipfile.ZIP_STORED)
+        self.package.writestr('META-INF/container.xml', EPUB_CONTAINER_XML)
+        self.package.writestr('EPUB/style/nav.css', render_stylesheet('reports/epub.css', processor.theme_options()))
+        self.package.writestr('EPUB/intro.xhtml', app.jinja_env.get_template('reports/epub_intro.html').render(**self.context))
+
+    def add_cue(self, cue, image_asset):
+        if image_asset is not None and image_asset.filename not in self.images:
+            # Cues that share a deduplicated screenshot reference a single archive entry
+            href = f"images/{image_asset.filename}"
+            self.package.write(image_asset.path, f"EPUB/{href}", zipfile.ZIP_STORED)
+            self.images[image_asset.filename] = (f"img_{self.count}", href, image_asset.media_type)
+        super().add_cue(cue, image_asset)
+
+    def write_page(self, page):
+        processor = self.processor
+        href = f"chapter_{page['index'] + 1}.xhtml"
+        for i, (cue, _) in enumerate(page['cues']):
+            self.toc.append((processor.get_heading_text(cue, page['offset'] + i), f"{href}#subtitle_{cue['number']}"))
+        self.package.writestr(f"EPUB/{href}", self.chapter_template.render(chapter_title=f"Section_{page['index'] + 1}",
+                                                                         blocks=Markup(self.page_blocks(page))))
+        self.chapters.append((f"chapter_{page['index'] + 1}", href))
+
+    def write_template(self, name, template_name, **context):
+        with self.package.open(name, 'w') as f:
+            for chunk in app.jinja_env.get_template(template_name).generate(**context):
+                f.write(chunk.encode('utf-8'))
+
+    def finish(self):
+        try:
+            self.flush_page()
+            context = dict(self.context, identifier=self.identifier, toc=self.toc)
+            self.write_template('EPUB/nav.xhtml', 'reports/epub_nav.xhtml', **context)
+            self.write_template('EPUB/toc.ncx', 'reports/epub_toc.xml', **context)
+            self.write_template('EPUB/content.opf', 'reports/epub_package.xml', chapters=self.chapters,
+                                images=self.images.values(), modified=datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'), **context)
+        finally:
+            self.close()
+        self.log_saved()
+        return self.output_path
+
+    def close(self):
+        self.package.close()
+
+@register_writer('docx')
+class DocxReportWriter(PagedReportWriter):
+    def begin(self, subtitles):
+        from docx import Document
+        from docx.shared import Inches, Pt, RGBColor
+        from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+        from docx.oxml.shared import OxmlElement, qn
+        super().begin(subtitles)
+        processor = self.processor
         doc = Document()
-        if self.narrow_borders:
+        if processor.narrow_borders:
             sections = doc.sections
             for section in sections:
                 section.top_margin = Inches(0.5)
                 section.bottom_margin = Inches(0.5)
                 section.left_margin = Inches(0.5)
                 section.right_margin = Inches(0.5)
-        if self.dark_theme:
+        if processor.dark_theme:
             section = doc.sections[0]
             sectPr = section._sectPr
             pgBg = OxmlElement("w:background")
@@ -143,632 +1594,741 @@ class SubtitleProcessor:
             pgBg = OxmlElement("w:background")
             pgBg.set(qn("w:color"), "ffffff")
             sectPr.append(pgBg)
-        title = doc.add_heading(self.custom_title or 'Video Subtitle Report', 0)
+        title = doc.add_heading(processor.custom_title or 'Video Subtitle Report', 0)
         title.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
         title.paragraph_format.space_before = Pt(0)
         title.paragraph_format.space_after = Pt(0)
         for run in title.runs:
-            run.font.color.rgb = RGBColor(*self.hex_to_rgb(self.text_color)) if not self.dark_theme else RGBColor(255, 255, 255)
+            run.font.color.rgb = RGBColor(*processor.hex_to_rgb(processor.text_color)) if not processor.dark_theme else RGBColor(255, 255, 255)
         summary_p = doc.add_paragraph()
         summary_p.paragraph_format.space_before = Pt(0)
         summary_p.paragraph_format.space_after = Pt(0)
         summary_p.paragraph_format.line_spacing = 1.0
         summary_run = summary_p.add_run('Total subtitles: ')
         summary_run.bold = True
-        summary_run.font.color.rgb = RGBColor(*self.hex_to_rgb(self.text_color)) if not self.dark_theme else RGBColor(255, 255, 255)
+        summary_run.font.color.rgb = RGBColor(*processor.hex_to_rgb(processor.text_color)) if not processor.dark_theme else RGBColor(255, 255, 255)
         count_run = summary_p.add_run(str(len(subtitles)))
-        count_run.font.color.rgb = RGBColor(*self.hex_to_rgb(self.text_color)) if not self.dark_theme else RGBColor(255, 255, 255)
+        count_run.font.color.rgb = RGBColor(*processor.hex_to_rgb(processor.text_color)) if not processor.dark_theme else RGBColor(255, 255, 255)
         date_p = doc.add_paragraph()
         date_p.paragraph_format.space_before = Pt(0)
         date_p.paragraph_format.space_after = Pt(0)
         date_p.paragraph_format.line_spacing = 1.0
         date_label_run = date_p.add_run('Generated on: ')
         date_label_run.bold = True
-        date_label_run.font.color.rgb = RGBColor(*self.hex_to_rgb(self.text_color)) if not self.dark_theme else RGBColor(255, 255, 255)
+        date_label_run.font.color.rgb = RGBColor(*processor.hex_to_rgb(processor.text_color)) if not processor.dark_theme else RGBColor(255, 255, 255)
         date_run = date_p.add_run(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        date_run.font.color.rgb = RGBColor(*self.hex_to_rgb(self.text_color)) if not self.dark_theme else RGBColor(255, 255, 255)
-        text_rgb = self.hex_to_rgb(self.text_color)
-        label_rgb = self.hex_to_rgb(self.label_color)
-        temp_dir = images_folder if images_folder else tempfile.mkdtemp()
+        date_run.font.color.rgb = RGBColor(*processor.hex_to_rgb(processor.text_color)) if not processor.dark_theme else RGBColor(255, 255, 255)
+        self.doc = doc
+
+    def write_page(self, page):
+        from docx.shared import Inches, Pt, RGBColor
+        from docx.oxml.shared import OxmlElement, qn
+        from PIL import Image
+        processor = self.processor
+        doc = self.doc
+        text_rgb = processor.hex_to_rgb(processor.text_color)
+        label_rgb = processor.hex_to_rgb(processor.label_color)
+        if not page['first'] and processor.page_organization:
+            doc.add_page_break()
+        for i, (subtitle, screenshot) in enumerate(page['cues']):
+            global_idx = page['offset'] + i
+            heading = doc.add_heading(processor.get_heading_text(subtitle, global_idx), level=2)
+            heading.paragraph_format.space_before = Pt(0)
+            heading.paragraph_format.space_after = Pt(0)
+            heading.paragraph_format.line_spacing = 1.0
+            for run in heading.runs:
+                run.font.color.rgb = RGBColor(*text_rgb) if not processor.dark_theme else RGBColor(255, 255, 255)
+                run.font.size = Pt(14)
+            if processor.add_bookmarks:
+                bookmark_name = f"{self.video_name}_subtitle_{subtitle['number']}"
+                bookmark_start = OxmlElement("w:bookmarkStart")
+                bookmark_start.set(qn("w:id"), str(global_idx))
+                bookmark_start.set(qn("w:name"), bookmark_name)
+                bookmark_end = OxmlElement("w:bookmarkEnd")
+                bookmark_end.set(qn("w:id"), str(global_idx))
+                heading._p.append(bookmark_start)
+                heading._p.append(bookmark_end)
+            timing_p = doc.add_paragraph()
+            timing_p.paragraph_format.space_before = Pt(0)
+            timing_p.paragraph_format.space_after = Pt(0)
+            timing_p.paragraph_format.line_spacing = 1.0
+            timing_label_run = timing_p.add_run('Time: ')
+            timing_label_run.bold = True
+            timing_label_run.font.color.rgb = RGBColor(*text_rgb) if not processor.dark_theme else RGBColor(255, 255, 255)
+            timing_label_run.font.size = Pt(10)
+            start_formatted = processor.format_time(subtitle['start_time'])
+            end_formatted = processor.format_time(subtitle['end_time'])
+            time_run = timing_p.add_run(f"{start_formatted} → {end_formatted}")
+            time_run.font.color.rgb = RGBColor(*text_rgb) if not processor.dark_theme else RGBColor(255, 255, 255)
+            time_run.font.size = Pt(10)
+            text_p = doc.add_paragraph()
+            text_p.paragraph_format.space_before = Pt(0)
+            text_p.paragraph_format.space_after = Pt(0)
+            text_p.paragraph_format.line_spacing = 1.0
+            text_label_run = text_p.add_run('Text: ')
+            text_label_run.bold = True
+            text_label_run.font.color.rgb = RGBColor(*label_rgb)
+            text_label_run.font.size = Pt(10)
+            text_content_run = text_p.add_run(subtitle['text'])
+            text_content_run.font.color.rgb = RGBColor(*text_rgb) if not processor.dark_theme else RGBColor(255, 255, 255)
+            text_content_run.font.size = Pt(10)
+            if screenshot is not None:
+                screenshot_p = doc.add_paragraph()
+                screenshot_p.paragraph_format.space_before = Pt(0)
+                screenshot_p.paragraph_format.space_after = Pt(0)
+                screenshot_p.paragraph_format.line_spacing = 1.0
+                screenshot_label_run = screenshot_p.add_run('Screenshot: ')
+                screenshot_label_run.bold = True
+                screenshot_label_run.font.color.rgb = RGBColor(*text_rgb) if not processor.dark_theme else RGBColor(255, 255, 255)
+                screenshot_label_run.font.size = Pt(10)
+                if screenshot.media_type == "image/webp":
+                    # python-docx cannot embed WebP, so convert just for this document
+                    buffer = io.BytesIO()
+                    Image.open(screenshot.path).save(buffer, format="PNG")
+                    buffer.seek(0)
+                    doc.add_picture(buffer, width=Inches(6.5))
+                else:
+                    doc.add_picture(screenshot.path, width=Inches(6.5))
+        if not processor.page_organization and not page['last']:
+            separator_p = doc.add_paragraph('─' * 50)
+            separator_p.paragraph_format.space_before = Pt(0)
+            separator_p.paragraph_format.space_after = Pt(0)
+            separator_p.paragraph_format.line_spacing = 1.0
+            for run in separator_p.runs:
+                run.font.color.rgb = RGBColor(*text_rgb) if not processor.dark_theme else RGBColor(255, 255, 255)
+
+    def finish(self):
+        self.flush_page()
+        self.doc.save(self.output_path)
+        self.log_saved()
+        return self.output_path
+
+class FastDocxReportWriter(PagedReportWriter):
+    # Writes the WordprocessingML package directly (used for 'docx' when fast_docx is set).
+    # Media parts go into the package as their cues arrive while document.xml is spooled to a
+    # temp file one page at a time, then copied in by finish(); no document tree is held in memory.
+    label = 'DOCX'
+
+    def begin(self, subtitles):
+        super().begin(subtitles)
+        processor = self.processor
+        self.media = {}
+        self.package = zipfile.ZipFile(self.output_path, 'w', zipfile.ZIP_DEFLATED)
+        self.document = tempfile.TemporaryFile()
+        background = f'<w:background w:color="{"1A1A1A" if processor.dark_theme else "FFFFFF"}"/>'
+        header = [
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<w:document {DOCX_NAMESPACES}>{background}<w:body>',
+            processor.docx_paragraph('Title', [(None, processor.custom_title or 'Video Subtitle Report')]),
+            processor.docx_paragraph('Normal', [('Label', 'Total subtitles: '), (None, str(len(subtitles)))]),
+            processor.docx_paragraph('Normal', [('Label', 'Generated on: '), (None, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))]),
+        ]
+        self.document.write(''.join(header).encode('utf-8'))
+
+    def add_cue(self, cue, image_asset):
+        if image_asset is not None and image_asset.path not in self.media:
+            self.add_media(image_asset)
+        super().add_cue(cue, image_asset)
+
+    def add_media(self, screenshot):
+        from PIL import Image
+        rel_id = f"rIdImage{len(self.media) + 1}"
+        with Image.open(screenshot.path) as image:
+            size = image.size
+            if screenshot.media_type == "image/webp":
+                # Word cannot display WebP, so convert just for this document
+                buffer = io.BytesIO()
+                image.save(buffer, format="PNG")
+                target = f"media/image{len(self.media) + 1}.png"
+                self.package.writestr(f"word/{target}", buffer.getvalue(), zipfile.ZIP_STORED)
+            else:
+                target = f"media/image{len(self.media) + 1}.{'png' if screenshot.media_type == 'image/png' else 'jpg'}"
+                self.package.write(screenshot.path, f"word/{target}", zipfile.ZIP_STORED)
+        self.media[screenshot.path] = (rel_id, target, size)
+
+    def write_page(self, page):
+        processor = self.processor
+        parts = []
+        if not page['first'] and processor.page_organization:
+            parts.append('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+        for i, (subtitle, screenshot) in enumerate(page['cues']):
+            global_idx = page['offset'] + i
+            bookmark = ''
+            if processor.add_bookmarks:
+                bookmark_name = xml_escape(f"{self.video_name}_subtitle_{subtitle['number']}", {'"': '&quot;'})
+                bookmark = (f'<w:bookmarkStart w:id="{global_idx}" w:name="{bookmark_name}"/>'
+                            f'<w:bookmarkEnd w:id="{global_idx}"/>')
+            parts.append(processor.docx_paragraph('Heading2', [(None, processor.get_heading_text(subtitle, global_idx))], bookmark))
+            time_text = f"{processor.format_time(subtitle['start_time'])} → {processor.format_time(subtitle['end_time'])}"
+            parts.append(processor.docx_paragraph('SubtitleBody', [('Label', 'Time: '), (None, time_text)]))
+            parts.append(processor.docx_paragraph('SubtitleBody', [('TextLabel', 'Text: '), (None, subtitle['text'])]))
+            if screenshot is not None:
+                rel_id, target, size = self.media[screenshot.path]
+                parts.append(processor.docx_paragraph('SubtitleBody', [('Label', 'Screenshot: ')]))
+                parts.append(processor.docx_picture(rel_id, global_idx + 1, screenshot.filename, size))
+        if not processor.page_organization and not page['last']:
+            parts.append(processor.docx_paragraph('Normal', [(None, '─' * 50)]))
+        self.document.write(''.join(parts).encode('utf-8'))
+
+    def finish(self):
+        processor = self.processor
+        package = self.package
         try:
-            for page_start in range(0, len(subtitles), self.subtitles_per_page):
-                if not self.is_processing:
-                    break
-                if page_start > 0 and self.page_organization:
-                    doc.add_page_break()
-                page_subtitles = subtitles[page_start:page_start + self.subtitles_per_page]
-                page_screenshots = screenshots[page_start:page_start + self.subtitles_per_page]
-                for i, (subtitle, screenshot) in enumerate(zip(page_subtitles, page_screenshots)):
-                    global_idx = page_start + i
-                    heading = doc.add_heading(self.get_heading_text(subtitle, global_idx), level=2)
-                    heading.paragraph_format.space_before = Pt(0)
-                    heading.paragraph_format.space_after = Pt(0)
-                    heading.paragraph_format.line_spacing = 1.0
-                    for run in heading.runs:
-                        run.font.color.rgb = RGBColor(*text_rgb) if not self.dark_theme else RGBColor(255, 255, 255)
-                        run.font.size = Pt(14)
-                    if self.add_bookmarks:
-                        bookmark_name = f"{video_name}_subtitle_{subtitle['number']}"
-                        bookmark_start = OxmlElement("w:bookmarkStart")
-                        bookmark_start.set(qn("w:id"), str(global_idx))
-                        bookmark_start.set(qn("w:name"), bookmark_name)
-                        bookmark_end = OxmlElement("w:bookmarkEnd")
-                        bookmark_end.set(qn("w:id"), str(global_idx))
-                        heading._p.append(bookmark_start)
-                        heading._p.append(bookmark_end)
-                    timing_p = doc.add_paragraph()
-                    timing_p.paragraph_format.space_before = Pt(0)
-                    timing_p.paragraph_format.space_after = Pt(0)
-                    timing_p.paragraph_format.line_spacing = 1.0
-                    timing_label_run = timing_p.add_run('Time: ')
-                    timing_label_run.bold = True
-                    timing_label_run.font.color.rgb = RGBColor(*text_rgb) if not self.dark_theme else RGBColor(255, 255, 255)
-                    timing_label_run.font.size = Pt(10)
-                    start_formatted = self.format_time(subtitle['start_time'])
-                    end_formatted = self.format_time(subtitle['end_time'])
-                    time_run = timing_p.add_run(f"{start_formatted} → {end_formatted}")
-                    time_run.font.color.rgb = RGBColor(*text_rgb) if not self.dark_theme else RGBColor(255, 255, 255)
-                    time_run.font.size = Pt(10)
-                    text_p = doc.add_paragraph()
-                    text_p.paragraph_format.space_before = Pt(0)
-                    text_p.paragraph_format.space_after = Pt(0)
-                    text_p.paragraph_format.line_spacing = 1.0
-                    text_label_run = text_p.add_run('Text: ')
-                    text_label_run.bold = True
-                    text_label_run.font.color.rgb = RGBColor(*label_rgb)
-                    text_label_run.font.size = Pt(10)
-                    text_content_run = text_p.add_run(subtitle['text'])
-                    text_content_run.font.color.rgb = RGBColor(*text_rgb) if not self.dark_theme else RGBColor(255, 255, 255)
-                    text_content_run.font.size = Pt(10)
-                    if screenshot is not None:
-                        screenshot_p = doc.add_paragraph()
-                        screenshot_p.paragraph_format.space_before = Pt(0)
-                        screenshot_p.paragraph_format.space_after = Pt(0)
-                        screenshot_p.paragraph_format.line_spacing = 1.0
-                        screenshot_label_run = screenshot_p.add_run('Screenshot: ')
-                        screenshot_label_run.bold = True
-                        screenshot_label_run.font.color.rgb = RGBColor(*text_rgb) if not self.dark_theme else RGBColor(255, 255, 255)
-                        screenshot_label_run.font.size = Pt(10)
-                        img_path = os.path.join(temp_dir, f'screenshot_{global_idx}.png')
-                        img = Image.fromarray(screenshot)
-                        img.save(img_path)
-                        doc.add_picture(img_path, width=Inches(6.5))
-                if not self.page_organization and page_start + self.subtitles_per_page < len(subtitles):
-                    separator_p = doc.add_paragraph('─' * 50)
-                    separator_p.paragraph_format.space_before = Pt(0)
-                    separator_p.paragraph_format.space_after = Pt(0)
-                    separator_p.paragraph_format.line_spacing = 1.0
-                    for run in separator_p.runs:
-                        run.font.color.rgb = RGBColor(*text_rgb) if not self.dark_theme else RGBColor(255, 255, 255)
+            self.flush_page()
+            margin = 720 if processor.narrow_borders else 1440
+            self.document.write(f'<w:sectPr><w:pgSz w:w="12240" w:h="15840"/><w:pgMar w:top="{margin}" w:right="{margin}" '
+                                f'w:bottom="{margin}" w:left="{margin}" w:header="720" w:footer="720" w:gutter="0"/>'
+                                f'</w:sectPr></w:body></w:document>'.encode('utf-8'))
+            self.document.seek(0)
+            with package.open('word/document.xml', 'w') as document:
+                shutil.copyfileobj(self.document, document, 1024 * 1024)
+            relationships = ''.join(f'<Relationship Id="{rel_id}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/image" Target="{target}"/>'
+                                    for rel_id, target, _ in self.media.values())
+            package.writestr('word/_rels/document.xml.rels',
+                             '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                             '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                             '<Relationship Id="rIdStyles" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+                             '<Relationship Id="rIdSettings" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/settings" Target="settings.xml"/>'
+                             f'{relationships}</Relationships>')
+            package.writestr('word/styles.xml', processor.docx_styles_xml())
+            package.writestr('word/settings.xml',
+                             f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<w:settings {DOCX_NAMESPACES}>'
+                             '<w:displayBackgroundShape/></w:settings>')
+            package.writestr('docProps/core.xml',
+                             '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                             '<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+                             'xmlns:dc="http://purl.org/dc/elements/1.1/">'
+                             f'<dc:title>{xml_escape(processor.custom_title or "Video Subtitle Report")}</dc:title></cp:coreProperties>')
+            package.writestr('_rels/.rels',
+                             '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                             '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                             '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>'
+                             '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" Target="docProps/core.xml"/>'
+                             '</Relationships>')
+            package.writestr('[Content_Types].xml',
+                             '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                             '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                             '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                             '<Default Extension="xml" ContentType="application/xml"/>'
+                             '<Default Extension="png" ContentType="image/png"/>'
+                             '<Default Extension="jpg" ContentType="image/jpeg"/>'
+                             '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+                             '<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+                             '<Override PartName="/word/settings.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/>'
+                             '<Override PartName="/docProps/core.xml" ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>'
+                             '</Types>')
         finally:
-            if not images_folder:
-                for file in os.listdir(temp_dir):
-                    os.remove(os.path.join(temp_dir, file))
-                os.rmdir(temp_dir)
-        doc.save(output_path)
-        self.log_message(f"DOCX saved to: {output_path}", log_list)
-
-    def create_markdown_report(self, subtitles, screenshots, output_path, relative_path, base_output_dir, log_list):
-        output_path, images_folder = self.create_output_folder(output_path, relative_path, base_output_dir)
-        content = []
-        content.append(f"# {self.custom_title or 'Video Subtitle Report'}\n")
-        content.append(f"**Total subtitles:** {len(subtitles)}\n")
-        content.append(f"**Generated on:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        content.append(f"**Theme:** {'Dark' if self.dark_theme else 'Light'}\n")
-        temp_dir = images_folder if images_folder else tempfile.mkdtemp()
+            self.close()
+        self.log_saved()
+        return self.output_path
+
+    def close(self):
         try:
-            for page_start in range(0, len(subtitles), self.subtitles_per_page):
-                if not self.is_processing:
-                    break
-                if page_start > 0 and self.page_organization:
-                    content.append('<div class="page-break"></div>\n')
-                page_subtitles = subtitles[page_start:page_start + self.subtitles_per_page]
-                page_screenshots = screenshots[page_start:page_start + self.subtitles_per_page]
-                for i, (subtitle, screenshot) in enumerate(zip(page_subtitles, page_screenshots)):
-                    global_idx = page_start + i
-                    heading_text = self.get_heading_text(subtitle, global_idx)
-                    content.append(f"## {heading_text}\n")
-                    start_formatted = self.format_time(subtitle['start_time'])
-                    end_formatted = self.format_time(subtitle['end_time'])
-                    content.append(f"**Time:** {start_formatted} → {end_formatted}\n")
-                    content.append(f'<span class="text-label">Text: </span>')
-                    content.append(f'<span class="subtitle-text">{subtitle["text"]}</span>\n')
-                    if screenshot is not None:
-                        img_filename = f'screenshot_{global_idx}.png'
-                        img_path = os.path.join(temp_dir, img_filename)
-                        img = Image.fromarray(screenshot)
-                        img.save(img_path)
-                        img_relative_path = f"images/{img_filename}" if images_folder else img_filename
-                        content.append(f"**Screenshot:**\n")
-                        content.append(f"![Screenshot {global_idx+1}]({img_relative_path})\n")
-                if not self.page_organization:
-                    content.append("---\n")
+            self.package.close()
         finally:
-            if not images_folder:
-                for file in os.listdir(temp_dir):
-                    temp_file_path = os.path.join(temp_dir, file)
-                    if os.path.exists(temp_file_path):
-                        os.remove(temp_file_path)
-                os.rmdir(temp_dir)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(''.join(content))
-        self.log_message(f"Markdown saved to: {output_path}", log_list)
-        if images_folder:
-            self.log_message(f"Images saved to: {images_folder}", log_list)
-
-    def create_html_report(self, subtitles, screenshots, output_path, relative_path, base_output_dir, log_list):
-        output_path, images_folder = self.create_output_folder(output_path, relative_path, base_output_dir)
-        spacing_style = "margin: 0; padding: 0;" if self.no_spacing else "margin: 0.5em 0;"
-        border_style = "margin: 10px;" if self.narrow_borders else "margin: 20px;"
-        bg_color = "#1a1a1a" if self.dark_theme else "#ffffff"
-        text_color = self.text_color if not self.dark_theme else "#ffffff"
-        heading_color = self.text_color if not self.dark_theme else "#ffffff"
-        border_color = "#333333" if self.dark_theme else "#ddd"
-        highlight_bg = "#2a2a2a" if self.dark_theme else "#f9f9f9"
-        html_content = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{self.custom_title or 'Video Subtitle Report'}</title>
-    <style>
-        @page {{
-            size: A4;
-            margin: {'10mm' if self.narrow_borders else '25mm'};
-        }}
-        body {{
-            font-family: Arial, sans-serif;
-            {border_style}
-            line-height: 1.2;
-            background-color: {bg_color} !important;
-            color: {text_color} !important;
-            margin: 0;
-            padding: 10px;
-        }}
-        h1 {{
-            text-align: center;
-            color: {heading_color} !important;
-            margin: 0 0 10px 0;
-            font-size: 24px;
-        }}
-        h2 {{
-            color: {heading_color} !important;
-            border-bottom: 1px solid {border_color};
-            padding-bottom: 2px;
-            margin: 5px 0;
-            font-size: 16px;
-        }}
-        .subtitle-block {{
-            {spacing_style}
-            page-break-inside: avoid;
-            margin-bottom: 8px;
-        }}
-        .page-break {{
-            page-break-before: always;
-        }}
-        .timing {{
-            font-weight: bold;
-            color: {text_color} !important;
-            margin: 2px 0;
-            font-size: 12px;
-        }}
-        .text-content {{
-            background: {highlight_bg};
-            padding: 6px;
-            border-left: 3px solid #007acc;
-            page-break-inside: avoid;
-            margin: 4px 0;
-            font-size: 13px;
-        }}
-        .text-label {{
-            color: {self.label_color} !important;
-            font-weight: bold;
-        }}
-        .subtitle-text {{
-            color: {text_color} !important;
-        }}
-        img {{
-            max-width: 100%;
-            height: auto;
-            border: 1px solid {border_color};
-            display: block;
-            margin: 4px auto;
-            page-break-inside: avoid;
-        }}
-        .separator {{
-            text-align: center;
-            color: #ccc;
-            {spacing_style}
-        }}
-        .report-info {{
-            background: {highlight_bg};
-            padding: 10px;
-            border-radius: 5px;
-            margin-bottom: 10px;
-            color: {text_color} !important;
-            font-size: 14px;
-        }}
-        nav {{
-            background: {highlight_bg};
-            padding: 10px;
-            border-radius: 5px;
-            margin-bottom: 10px;
-        }}
-        nav a {{
-            color: #007acc !important;
-        }}
-    </style>
-</head>
-<body>
-    <h1>{self.custom_title or 'Video Subtitle Report'}</h1>
-    <div class="report-info">
-        <p><strong>Total subtitles:</strong> {len(subtitles)}</p>
-        <p><strong>Generated on:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        <p><strong>Theme:</strong> {'Dark' if self.dark_theme else 'Light'}</p>
-    </div>
-"""
-        if self.add_bookmarks:
-            html_content += f"\n<nav><h3>Bookmarks</h3><ul>\n"
-            for i, subtitle in enumerate(subtitles):
-                heading_text = self.get_heading_text(subtitle, i)
-                html_content += f'<li><a href="#subtitle_{subtitle["number"]}">{heading_text}</a></li>\n'
-            html_content += "</ul></nav>\n"
-        temp_dir = images_folder if images_folder else tempfile.mkdtemp()
+            self.document.close()
+
+PROCESS_WRITER_FORMATS = {'docx'}  # built in a worker process when formats render concurrently
+
+class ProcessReportWriter(ReportWriter):
+    # Runs WRITER_CLASS in its own process so pure-Python document building does not hold the GIL
+    # against capture and the other writers. Cues cross over with their ImageAssets, which only
+    # carry the stored file paths; the worker reads the images from disk itself.
+    def __init__(self, writer_class, processor, output_path, video_name, base_output_dir, log_list, relative_path=""):
+        super().__init__(processor, output_path, video_name, base_output_dir, log_list, relative_path)
+        self.writer_class = writer_class
+        self.format_name = writer_class.format_name
+        self.label = writer_class.label
+        self.writer_args = (output_path, video_name, base_output_dir, relative_path)
+        self.process = None
+
+    def begin(self, subtitles):
+        super().begin(subtitles)
+        self.cues = multiprocessing.Queue(maxsize=256)
+        self.results = multiprocessing.Queue()
+        self.process = multiprocessing.Process(target=_run_process_writer, daemon=True,
+                                               args=(self.writer_class, self.processor, self.writer_args, subtitles,
+                                                     self.cues, self.results))
+        self.process.start()
+
+    def send(self, item):
+        while True:
+            try:
+                self.cues.put(item, timeout=1)
+                return
+            except queue.Full:
+                if not self.process.is_alive():
+                    raise RuntimeError(self.worker_error())
+
+    def worker_error(self):
+        # The worker reports its own error before exiting; fall back to the exit code
         try:
-            for page_start in range(0, len(subtitles), self.subtitles_per_page):
-                if not self.is_processing:
-                    break
-                page_subtitles = subtitles[page_start:page_start + self.subtitles_per_page]
-                page_screenshots = screenshots[page_start:page_start + self.subtitles_per_page]
-                if page_start > 0 and self.page_organization:
-                    html_content += '<div class="page-break"></div>\n'
-                for i, (subtitle, screenshot) in enumerate(zip(page_subtitles, page_screenshots)):
-                    global_idx = page_start + i
-                    heading_text = self.get_heading_text(subtitle, global_idx)
-                    bookmark_id = f'subtitle_{subtitle["number"]}' if self.add_bookmarks else ''
-                    html_content += f'\n<div class="subtitle-block">\n'
-                    html_content += f'<h2 id="{bookmark_id}">{heading_text}</h2>\n'
-                    start_formatted = self.format_time(subtitle['start_time'])
-                    end_formatted = self.format_time(subtitle['end_time'])
-                    html_content += f'<p class="timing"><strong>Time:</strong> {start_formatted} → {end_formatted}</p>\n'
-                    html_content += f'<div class="text-content">'
-                    html_content += f'<span class="text-label">Text: </span>'
-                    html_content += f'<span class="subtitle-text">{subtitle["text"].replace(chr(10), "<br>")}</span>'
-                    html_content += f'</div>\n'
-                    if screenshot is not None:
-                        img_filename = f'screenshot_{global_idx}.png'
-                        img_path = os.path.join(temp_dir, img_filename)
-                        img = Image.fromarray(screenshot)
-                        img.save(img_path)
-                        img_src = f"images/{img_filename}" if images_folder else img_filename
-                        html_content += f'<p><strong>Screenshot:</strong></p>\n'
-                        html_content += f'<img src="{img_src}" alt="Screenshot {global_idx+1}" />\n'
-                    html_content += '</div>\n'
-                if not self.page_organization and page_start + self.subtitles_per_page < len(subtitles):
-                    html_content += '<div class="separator">─────────────────────────────────────────</div>\n'
-        finally:
-            if not images_folder:
-                for file in os.listdir(temp_dir):
-                    temp_file_path = os.path.join(temp_dir, file)
-                    if os.path.exists(temp_file_path):
-                        os.remove(temp_file_path)
-                os.rmdir(temp_dir)
-        html_content += "\n</body>\n</html>"
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        self.log_message(f"HTML saved to: {output_path}", log_list)
-        if images_folder:
-            self.log_message(f"Images saved to: {images_folder}", log_list)
-
-    def create_epub_report(self, subtitles, screenshots, output_path, relative_path, base_output_dir, log_list):
-        output_path, images_folder = self.create_output_folder(output_path, relative_path, base_output_dir)
-        book = epub.EpubBook()
-        book.set_identifier(str(uuid.uuid4()))
-        book.set_title(self.custom_title or 'Video Subtitle Report')
-        book.set_language('en')
-        book.add_author('Enhanced Video Subtitle Extractor')
-        css_content = f"""
-            body {{ background-color: {'#1a1a1a' if self.dark_theme else '#ffffff'} !important;
-                    color: {self.text_color if not self.dark_theme else '#ffffff'} !important;
-                    line-height: 1.2;
-                    margin: 0;
-                    padding: 10px; }}
-            h1, h2 {{ color: {self.text_color if not self.dark_theme else '#ffffff'} !important;
-                      margin: 5px 0; }}
-            .subtitle-text {{ color: {self.text_color if not self.dark_theme else '#ffffff'} !important; }}
-            .text-label {{ color: {self.label_color} !important; font-weight: bold; }}
-            .timing {{ color: {self.text_color if not self.dark_theme else '#ffffff'} !important;
-                      font-weight: bold;
-                      margin: 2px 0;
-                      font-size: 12px; }}
-            .report-info {{ background: {'#2a2a2a' if self.dark_theme else '#f9f9f9'};
-                           padding: 10px;
-                           border-radius: 5px;
-                           margin-bottom: 10px; }}
-            img {{ max-width: 100%;
-                   border: 1px solid {'#333' if self.dark_theme else '#ddd'};
-                   margin: 4px auto; }}
-            .subtitle-block {{ margin-bottom: 8px; }}
-        """
-        nav_css = epub.EpubItem(uid="nav_css", file_name="style/nav.css", media_type="text/css", content=css_content.encode('utf-8'))
-        book.add_item(nav_css)
-        intro_content = f"""
-        <html><head><link rel="stylesheet" href="style/nav.css"/></head><body>
-        <h1>{self.custom_title or 'Video Subtitle Report'}</h1>
-        <div class="report-info">
-            <p><strong>Total subtitles:</strong> {len(subtitles)}</p>
-            <p><strong>Generated on:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-            <p><strong>Theme:</strong> {'Dark' if self.dark_theme else 'Light'}</p>
-        </div>
-        </body></html>
-        """
-        intro_chapter = epub.EpubHtml(title='Introduction', file_name='intro.xhtml', lang='en')
-        intro_chapter.content = intro_content.encode('utf-8')
-        intro_chapter.add_item(nav_css)
-        book.add_item(intro_chapter)
-        chapters = [intro_chapter]
-        temp_dir = images_folder if images_folder else tempfile.mkdtemp()
+            status, result, log_list = self.results.get(timeout=1)
+        except queue.Empty:
+            return f"{self.format_name.upper()} worker process exited with code {self.process.exitcode}"
+        self.log_list.extend(log_list)
+        return result
+
+    def add_cue(self, cue, image_asset):
+        self.send((cue, image_asset))
+
+    def finish(self):
+        self.send(None)
+        while True:
+            try:
+                status, result, log_list = self.results.get(timeout=1)
+                break
+            except queue.Empty:
+                if not self.process.is_alive():
+                    raise RuntimeError(self.worker_error())
+        self.process.join()
+        self.log_list.extend(log_list)
+        if status != 'finished':
+            raise RuntimeError(result)
+        return result
+
+    def abort(self):
         try:
-            for page_start in range(0, len(subtitles), self.subtitles_per_page):
-                if not self.is_processing:
-                    break
-                page_subtitles = subtitles[page_start:page_start + self.subtitles_per_page]
-                page_screenshots = screenshots[page_start:page_start + self.subtitles_per_page]
-                chapter_content = f'<html><head><link rel="stylesheet" href="style/nav.css"/></head><body>'
-                for i, (subtitle, screenshot) in enumerate(zip(page_subtitles, page_screenshots)):
-                    global_idx = page_start + i
-                    heading_text = self.get_heading_text(subtitle, global_idx)
-                    chapter_content += f'<div class="subtitle-block">\n'
-                    chapter_content += f'<h2>{heading_text}</h2>\n'
-                    start_formatted = self.format_time(subtitle['start_time'])
-                    end_formatted = self.format_time(subtitle['end_time'])
-                    chapter_content += f'<p class="timing"><strong>Time:</strong> {start_formatted} → {end_formatted}</p>\n'
-                    chapter_content += f'<p><span class="text-label">Text: </span>'
-                    chapter_content += f'<span class="subtitle-text">{subtitle["text"].replace(chr(10), "<br/>")}</span></p>\n'
-                    if screenshot is not None:
-                        img_filename = f'screenshot_{global_idx}.png'
-                        img_path = os.path.join(temp_dir, img_filename)
-                        img = Image.fromarray(screenshot)
-                        img.save(img_path)
-                        with open(img_path, 'rb') as img_file:
-                            img_data = img_file.read()
-                        epub_img = epub.EpubItem(uid=f"img_{global_idx}", file_name=f"images/{img_filename}",
-                                              media_type="image/png", content=img_data)
-                        book.add_item(epub_img)
-                        chapter_content += f'<p><strong>Screenshot:</strong></p>\n'
-                        chapter_content += f'<img src="images/{img_filename}" alt="Screenshot {global_idx+1}" />\n'
-                    chapter_content += '</div>\n'
-                chapter_content += '</body></html>'
-                chapter = epub.EpubHtml(title=f"Section_{page_start//self.subtitles_per_page + 1}",
-                                     file_name=f'chapter_{page_start//self.subtitles_per_page + 1}.xhtml',
-                                     lang='en')
-                chapter.content = chapter_content.encode('utf-8')
-                chapter.add_item(nav_css)
-                book.add_item(chapter)
-                chapters.append(chapter)
+            if self.process is not None and self.process.is_alive():
+                try:
+                    self.cues.put_nowait(False)
+                except queue.Full:
+                    pass
+                self.process.join(timeout=10)
+                if self.process.is_alive():
+                    self.process.terminate()
+                    self.process.join()
         finally:
-            if not images_folder:
-                for file in os.listdir(temp_dir):
-                    temp_file_path = os.path.join(temp_dir, file)
-                    if os.path.exists(temp_file_path):
-                        os.remove(temp_file_path)
-                os.rmdir(temp_dir)
-        book.toc = chapters
-        book.add_item(epub.EpubNcx())
-        book.add_item(epub.EpubNav())
-        book.spine = ['nav'] + chapters
-        epub.write_epub(output_path, book, {})
-        self.log_message(f"EPUB saved to: {output_path}", log_list)
-
-    def create_pdf_report(self, subtitles, screenshots, output_path, relative_path, base_output_dir, log_list):
-        final_output_path, images_folder = self.create_output_folder(output_path, relative_path, base_output_dir)
-        temp_dir = tempfile.mkdtemp()
+            super().abort()
+
+class WriterFeed:
+    # Runs a group of report writers on a background thread: cues queued by the capture loop
+    # are handed to every writer in the group, and after close() each writer is finished (or
+    # aborted when the run was cancelled or capture failed). A writer that raises is dropped, its error kept
+    # for format_errors, and the others carry on.
+    def __init__(self, processor, writers, log_list, output_callback=None, queue_size=256):
+        self.processor = processor
+        self.writers = dict(writers)
+        self.log_list = log_list
+        self.output_callback = output_callback
+        self.outputs = {}
+        self.errors = {}
+        self.seconds = dict.fromkeys(self.writers, 0.0)
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def add_cue(self, cue, image_asset):
+        if not self.put((cue, image_asset)):
+            raise RuntimeError("Report writer thread stopped unexpectedly")
+
+    def close(self, finish=True):
+        # Queued cues are still written; FINISH decides whether the writers then finish or abort
+        self.put(finish)
+
+    def put(self, item):
+        # Never blocks on a full queue once the feed thread is gone; returns False in that case
+        while self.thread.is_alive():
+            try:
+                self.queue.put(item, timeout=1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def abort(self, name, writer):
         try:
-            html_filename = f"temp_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
-            html_path = os.path.join(temp_dir, html_filename)
-            self.create_html_for_pdf(subtitles, screenshots, html_path, images_folder or temp_dir)
-            margin = '0in' if self.no_spacing else ('0.5in' if self.narrow_borders else '1in')
-            pdf_css = f"""
-                @page {{
-                    size: A4;
-                    margin: {margin};
-                }}
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.0;
-                    background-color: {'#1a1a1a' if self.dark_theme else '#ffffff'} !important;
-                    color: {self.text_color if not self.dark_theme else '#ffffff'} !important;
-                    margin: 0;
-                    padding: 10px;
-                }}
-                h1 {{
-                    text-align: center;
-                    margin: 0 0 8px 0;
-                    font-size: 24pt;
-                }}
-                h2 {{
-                    color: {self.text_color if not self.dark_theme else '#ffffff'} !important;
-                    border-bottom: 1px solid {'#333' if self.dark_theme else '#ddd'};
-                    padding-bottom: 2px;
-                    margin: 4px 0;
-                    font-size: 16pt;
-                }}
-                .subtitle-block {{
-                    page-break-inside: avoid;
-                    margin-bottom: 6px;
-                    padding: 6px;
-                    border: 1px solid {'#333' if self.dark_theme else '#ddd'};
-                    border-radius: 4px;
-                }}
-                .page-break {{
-                    page-break-before: always;
-                }}
-                .timing {{
-                    font-weight: bold;
-                    color: {self.text_color if not self.dark_theme else '#ffffff'} !important;
-                    margin: 2px 0;
-                    font-size: 12pt;
-                }}
-                .text-content {{
-                    background: {'#2a2a2a' if self.dark_theme else '#f9f9f9'};
-                    padding: 6px;
-                    border-left: 2px solid #007acc;
-                    page-break-inside: avoid;
-                    margin: 4px 0;
-                    font-size: 13pt;
-                    line-height: 1.0;
-                }}
-                .text-label {{
-                    color: {self.label_color} !important;
-                    font-weight: bold;
-                }}
-                .subtitle-text {{
-                    color: {self.text_color if not self.dark_theme else '#ffffff'} !important;
-                }}
-                img {{
-                    max-width: 100%;
-                    height: auto;
-                    border: 1px solid {'#333' if self.dark_theme else '#ddd'};
-                    display: block;
-                    margin: 4px auto;
-                    page-break-inside: avoid;
-                }}
-                .report-info {{
-                    background: {'#2a2a2a' if self.dark_theme else '#f9f9f9'};
-                    padding: 8px;
-                    border-radius: 4px;
-                    margin-bottom: 8px;
-                    color: {self.text_color if not self.dark_theme else '#ffffff'} !important;
-                    font-size: 12pt;
-                }}
-                .screenshot-label {{
-                    font-weight: bold;
-                    margin: 2px 0;
-                    font-size: 12pt;
-                }}
-            """
-            if self.no_spacing:
-                pdf_css += """
-                body { line-height:1.0; padding:0; margin:0; }
-                h1 { margin:0 0 2px 0; }
-                h2 { margin:0; padding:0; }
-                .subtitle-block { margin:0; padding:0; border:none; }
-                .text-content { padding:2px; margin:0 0 2px 0; line-height:1.0; }
-                .timing { margin:0; }
-                .report-info { padding:2px; margin:0 0 2px 0; }
-                .screenshot-label { margin:0; }
-                img { max-width:100%; height:auto; border:none; margin:0 auto; }
-                """
-            html_doc = weasyprint.HTML(filename=html_path)
-            html_doc.write_pdf(final_output_path, stylesheets=[weasyprint.CSS(string=pdf_css)])
-            self.log_message(f"PDF saved to: {final_output_path}", log_list)
+            writer.abort()
         except Exception as e:
-            self.log_message(f"PDF conversion error: {str(e)}", log_list)
-            raise
+            self.processor.log_message(f"Failed to clean up {name.upper()} report: {str(e)}", self.log_list)
+
+    def fail(self, name, error):
+        self.abort(name, self.writers.pop(name))
+        self.errors[name] = str(error)
+        self.processor.log_message(f"Failed to create {name.upper()} report: {str(error)}", self.log_list)
+
+    def call(self, name, method, *args):
+        start = time.perf_counter()
+        try:
+            result = getattr(self.writers[name], method)(*args)
+        except Exception as e:
+            self.fail(name, e)
+            return None
         finally:
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir, ignore_errors=True)
-
-    def create_html_for_pdf(self, subtitles, screenshots, html_path, images_dir):
-        bg_color = "#1a1a1a" if self.dark_theme else "#ffffff"
-        text_color = self.text_color if not self.dark_theme else "#ffffff"
-        heading_color = self.text_color if not self.dark_theme else "#ffffff"
-        border_color = "#333333" if self.dark_theme else "#ddd"
-        highlight_bg = "#2a2a2a" if self.dark_theme else "#f9f9f9"
-        html_content = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <title>{self.custom_title or 'Video Subtitle Report'}</title>
-</head>
-<body>
-    <h1>{self.custom_title or 'Video Subtitle Report'}</h1>
-    <div class="report-info">
-        <p><strong>Total subtitles:</strong> {len(subtitles)}</p>
-        <p><strong>Generated on:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        <p><strong>Theme:</strong> {'Dark' if self.dark_theme else 'Light'}</p>
-    </div>
-"""
+            self.seconds[name] += time.perf_counter() - start
+        return result
+
+    def run(self):
         try:
-            for page_start in range(0, len(subtitles), self.subtitles_per_page):
-                if not self.is_processing:
-                    break
-                page_subtitles = subtitles[page_start:page_start + self.subtitles_per_page]
-                page_screenshots = screenshots[page_start:page_start + self.subtitles_per_page]
-                if page_start > 0:
-                    html_content += '<div class="page-break"></div>\n'
-                for i, (subtitle, screenshot) in enumerate(zip(page_subtitles, page_screenshots)):
-                    global_idx = page_start + i
-                    heading_text = self.get_heading_text(subtitle, global_idx)
-                    html_content += f'\n<div class="subtitle-block">\n'
-                    html_content += f'<h2>{heading_text}</h2>\n'
-                    start_formatted = self.format_time(subtitle['start_time'])
-                    end_formatted = self.format_time(subtitle['end_time'])
-                    html_content += f'<p class="timing"><strong>Time:</strong> {start_formatted} → {end_formatted}</p>\n'
-                    html_content += f'<div class="text-content">'
-                    html_content += f'<span class="text-label">Text: </span>'
-                    html_content += f'<span class="subtitle-text">{subtitle["text"].replace(chr(10), "<br>")}</span>'
-                    html_content += f'</div>\n'
-                    if screenshot is not None:
-                        img = Image.fromarray(screenshot)
-                        buffer = io.BytesIO()
-                        img.save(buffer, format="PNG")
-                        img_data = base64.b64encode(buffer.getvalue()).decode('utf-8')
-                        img_src = f"data:image/png;base64,{img_data}"
-                        html_content += f'<p class="screenshot-label"><strong>Screenshot:</strong></p>\n'
-                        html_content += f'<img src="{img_src}" alt="Screenshot {global_idx+1}" />\n'
-                    html_content += '</div>\n'
+            self.feed()
         except Exception as e:
-            raise
-        html_content += "\n</body>\n</html>"
-        with open(html_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            for name in list(self.writers):
+                self.fail(name, e)
 
-    def process_video(self, video_path, srt_path, base_output_dir, log_list):
-        if not self.is_processing:
-            return []
+    def feed(self):
+        while True:
+            item = self.queue.get()
+            if not isinstance(item, tuple):
+                break
+            for name in list(self.writers):
+                self.call(name, 'add_cue', *item)
+        if not item or not self.processor.is_processing:
+            for name, writer in self.writers.items():
+                self.abort(name, writer)
+            return
+        processor = self.processor
+        for name in list(self.writers):
+            output_path = self.call(name, 'finish')
+            if output_path is not None:
+                self.outputs[name] = output_path
+                processor.metrics.add(f'render_{name}', self.seconds[name], nbytes=os.path.getsize(output_path))
+                if self.output_callback:
+                    self.output_callback(output_path)
+            processor.progress['completed'] += 1
+
+def _capture_shard(video_path, shard, seek_threshold, image_profile=None):
+    # Runs in a worker process with its own VideoCapture over one time shard
+    processor = SubtitleProcessor(seek_threshold=seek_threshold, **(image_profile or {}))
+    processor.is_processing = True
+    log_list = []
+    timestamps = [timestamp for _, timestamp in shard]
+    if image_profile is not None:
+        frames = processor.capture_encoded_screenshots(video_path, timestamps, log_list)
+    else:
+        frames = processor.iter_screenshots(video_path, timestamps, log_list)
+    return [(shard[i][0], screenshot) for i, screenshot in frames], log_list
+
+stage_metrics = StageMetrics()
+
+# The caches are built on first use, so importing app (batch.py, benchmark workers, tests)
+# creates no cache directories; None when the cache is disabled
+caches = {}
+caches_lock = threading.Lock()
+
+def get_frame_cache():
+    with caches_lock:
+        if 'frames' not in caches:
+            caches['frames'] = FrameCache(app.config['FRAME_CACHE_FOLDER'], app.config['FRAME_CACHE_MAX_BYTES']) \
+                if app.config['FRAME_CACHE_MAX_BYTES'] else None
+        return caches['frames']
+
+def get_report_cache():
+    with caches_lock:
+        if 'reports' not in caches:
+            caches['reports'] = ReportCache(app.config['REPORT_CACHE_FOLDER'], app.config['REPORT_CACHE_MAX_BYTES'],
+                                            app.config['REPORT_CACHE_TTL']) if app.config['REPORT_CACHE_MAX_BYTES'] else None
+        return caches['reports']
+
+if app.config['PRELOAD_BACKENDS']:
+    warm_backends(app.config['PRELOAD_BACKENDS'])
+
+def lookup_report_cache(processor, video_path, srt_path, formats, video_hash=None, srt_hash=None):
+    # Returns (video_hash, report_key, cached_zip_path); the hash is reused by the frame cache
+    report_cache = get_report_cache()
+    if video_hash is None and (report_cache is not None or get_frame_cache() is not None):
+        video_hash = file_sha256(video_path)
+    if report_cache is None:
+        return video_hash, None, None
+    report_key = report_cache.key(video_hash, srt_hash or file_sha256(srt_path), processor.report_options(video_path), formats)
+    return video_hash, report_key, report_cache.get(report_key)
+
+def processor_from_form(form, video_filename):
+    use_video_name = 'use_video_name' in form
+    custom_title = form.get('custom_title', 'Video Subtitle Report')
+    if use_video_name:
+        custom_title = os.path.splitext(video_filename)[0]
+    return SubtitleProcessor(
+        subtitles_per_page=int(form.get('subtitles_per_page', 3)),
+        no_spacing='no_spacing' in form,
+        narrow_borders='narrow_borders' in form,
+        add_bookmarks='add_bookmarks' in form,
+        heading_style=form.get('heading_style', 'numbered'),
+        dark_theme='dark_theme' in form,
+        text_color=form.get('text_color', '#000000'),
+        label_color=form.get('label_color', '#FF0000'),
+        page_organization='page_organization' in form,
+        create_folder='create_folder' in form,
+        custom_title=custom_title,
+        image_width=int(form.get('image_width') or 0),
+        image_format=form.get('image_format', 'png'),
+        image_quality=int(form.get('image_quality') or 85),
+        # Paged HTML shows thumbnails that link to the full screenshots
+        thumbnail_width=THUMBNAIL_WIDTH if 'create_thumbnails' in form or 'html_paged' in form else 0,
+        concurrent_formats='concurrent_formats' in form,
+        fast_docx='fast_docx' in form,
+        html_paged='html_paged' in form,
+        html_cues_per_file=int(form.get('html_cues_per_file') or 0),
+        time_ranges=parse_ranges(form.get('time_ranges'), parse_time_value),
+        cue_ranges=parse_ranges(form.get('cue_ranges'), parse_cue_number),
+        pdf_chunk_pages=int(form.get('pdf_chunk_pages') or 0),
+        frame_cache=get_frame_cache(),
+        dedup_similarity=float(form.get('dedup_similarity') or 0),
+        metrics=StageMetrics(parent=stage_metrics),
+        capture_workers=app.config['CAPTURE_WORKERS'],
+        shard_seconds=app.config['CAPTURE_SHARD_SECONDS'],
+        shard_frames=app.config['CAPTURE_SHARD_FRAMES']
+    )
+
+def selected_formats(form):
+    return [format_name for format_name in EXPORT_FORMATS if form.get(f'export_{format_name}')]
+
+def zip_compress_type(filename):
+    extension = os.path.splitext(filename)[1].lower().lstrip('.')
+    return zipfile.ZIP_STORED if extension in STORED_ZIP_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+def build_reports_zip(output_dir):
+    # Zip the reports together with the shared images folder they reference
+    zip_path = os.path.join(output_dir, 'reports.zip')
+    with zipfile.ZipFile(zip_path, 'w') as zipf:
+        for root, _, files in os.walk(output_dir):
+            for file in files:
+                file_path = os.path.join(root, file)
+                if file_path != zip_path:
+                    zipf.write(file_path, os.path.relpath(file_path, output_dir), zip_compress_type(file))
+                    os.remove(file_path)
+    return zip_path
+
+class ZipStream:
+    # Write-only sink that lets zipfile build an archive on an unseekable stream;
+    # drain() hands over what has been written so far, tee keeps a copy on disk
+    def __init__(self, tee=None):
+        self.chunks = []
+        self.tee = tee
+
+    def write(self, data):
+        data = bytes(data)
+        self.chunks.append(data)
+        if self.tee:
+            self.tee.write(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+def iter_zip_member(zipf, stream, file_path, arcname, chunk_size=1024 * 1024):
+    zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+    zinfo.compress_type = zip_compress_type(file_path)
+    with open(file_path, 'rb') as src, zipf.open(zinfo, 'w') as dest:
+        for chunk in iter(lambda: src.read(chunk_size), b''):
+            dest.write(chunk)
+            yield stream.drain()
+    os.remove(file_path)
+    yield stream.drain()
+
+def stream_reports_zip(output_queue, first_path, output_dir, zip_path=None):
+    # Yields zip bytes for each report as soon as its writer finishes, then the shared images folder.
+    # output_queue carries finished report paths and ends with None or the exception that stopped processing.
+    tee = open(zip_path, 'wb') if zip_path else None
+    stream = ZipStream(tee)
+    try:
+        with zipfile.ZipFile(stream, 'w') as zipf:
+            path = first_path
+            while isinstance(path, str):
+                yield from iter_zip_member(zipf, stream, path, os.path.relpath(path, output_dir))
+                path = output_queue.get()
+            for root, _, files in os.walk(output_dir):
+                for file in files:
+                    file_path = os.path.join(root, file)
+                    if file_path != zip_path:
+                        yield from iter_zip_member(zipf, stream, file_path, os.path.relpath(file_path, output_dir))
+        yield stream.drain()
+    finally:
+        if tee:
+            tee.close()
+
+class Job:
+    def __init__(self, processor, video_path, srt_path, formats, upload_dir, video_hash=None, srt_hash=None):
+        self.id = uuid.uuid4().hex
+        self.processor = processor
+        self.video_path = video_path
+        self.srt_path = srt_path
+        self.video_hash = video_hash
+        self.srt_hash = srt_hash
+        self.formats = formats
+        self.upload_dir = upload_dir
+        self.output_dir = None
+        self.zip_path = None
+        self.status = 'queued'
+        self.error = None
+        self.log_list = []
+        self.future = None
+        self.created_at = time.time()
+        self.finished_at = None
+
+    def to_dict(self, log_offset=0):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'progress': dict(self.processor.progress),
+            'error': self.error,
+            'format_errors': dict(self.processor.format_errors),
+            'log': self.log_list[log_offset:],
+            'log_offset': log_offset,
+            'log_length': len(self.log_list),
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+        }
+
+class JobManager:
+    # Runs processing jobs in a bounded thread pool so requests return immediately. The
+    # synchronous upload route runs in the same pool so both share MAX_CONCURRENT_JOBS.
+    def __init__(self, max_workers, max_queued, result_ttl, prune_interval=60):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self.max_queued = max_queued
+        self.result_ttl = result_ttl
+        self.prune_interval = prune_interval
+        self.jobs = {}
+        self.inline_tasks = 0
+        self.lock = threading.Lock()
+        self.pruner = None
+
+    def get(self, job_id):
+        self.prune()
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def active(self):
+        # Caller holds self.lock
+        return self.inline_tasks + sum(1 for job in self.jobs.values() if job.status in ('queued', 'running'))
+
+    def submit(self, job):
+        self.prune()
+        with self.lock:
+            if self.active() >= self.max_queued:
+                return None
+            self.start_pruner()
+            self.jobs[job.id] = job
+            job.future = self.executor.submit(self.run, job)
+        return job
+
+    def submit_inline(self, fn):
+        # Returns the future of FN queued behind the jobs, or None when the queue is full
+        with self.lock:
+            if self.active() >= self.max_queued:
+                return None
+            self.start_pruner()
+            self.inline_tasks += 1
+            future = self.executor.submit(fn)
+        future.add_done_callback(self.inline_done)
+        return future
+
+    def inline_done(self, future):
+        with self.lock:
+            self.inline_tasks -= 1
+
+    def run(self, job):
+        with self.lock:
+            if job.status != 'queued':
+                return
+            job.status = 'running'
+            job.processor.is_processing = True
+        job.output_dir = tempfile.mkdtemp()
         try:
-            if not os.path.exists(video_path):
-                self.log_message(f"Skipping {video_path}: Video file not found", log_list)
-                return []
-            if not os.path.exists(srt_path):
-                self.log_message(f"Skipping {srt_path}: SRT file not found", log_list)
-                return []
-            video_name = os.path.splitext(os.path.basename(video_path))[0]
-            self.log_message(f"Processing video: {video_name}", log_list)
-            self.log_message(f"Document title: {self.custom_title or 'Video Subtitle Report'}", log_list)
-            subtitles = self.parse_srt_file(srt_path, log_list)
-            if not subtitles:
-                self.log_message(f"No subtitles found in {srt_path}", log_list)
-                return []
-            screenshots = []
-            total_subtitles = len(subtitles)
-            for i, subtitle in enumerate(subtitles):
-                if not self.is_processing:
-                    break
-                screenshot = self.capture_screenshot(video_path, subtitle['end_time'], log_list)
-                screenshots.append(screenshot)
-            output_files = []
-            format_funcs = {
-                'docx': lambda: self.create_docx_report(subtitles, screenshots, f"{video_name}_subtitles.docx", "", video_name, base_output_dir, log_list),
-                'pdf': lambda: self.create_pdf_report(subtitles, screenshots, f"{video_name}_subtitles.pdf", "", base_output_dir, log_list),
-                'html': lambda: self.create_html_report(subtitles, screenshots, f"{video_name}_subtitles.html", "", base_output_dir, log_list),
-                'md': lambda: self.create_markdown_report(subtitles, screenshots, f"{video_name}_subtitles.md", "", base_output_dir, log_list),
-                'epub': lambda: self.create_epub_report(subtitles, screenshots, f"{video_name}_subtitles.epub", "", base_output_dir, log_list)
-            }
-            for format_name in format_funcs:
-                if request.form.get(f'export_{format_name}'):
-                    self.log_message(f"Creating {format_name.upper()} report...", log_list)
-                    output_path = os.path.join(base_output_dir, f"{video_name}_subtitles.{format_name}")
-                    format_funcs[format_name]()
-                    output_files.append(output_path)
-            return output_files
+            video_hash, report_key, cached_zip = lookup_report_cache(job.processor, job.video_path, job.srt_path, job.formats,
+                                                                   job.video_hash, job.srt_hash)
+            if cached_zip:
+                job.processor.log_message("Serving identical report from the report cache", job.log_list)
+                job.zip_path = os.path.join(job.output_dir, 'reports.zip')
+                shutil.copyfile(cached_zip, job.zip_path)
+                job.status = 'finished'
+                return
+            output_files = job.processor.process_video(job.video_path, job.srt_path, job.output_dir, job.log_list,
+                                                       job.formats, video_hash)
+            if not job.processor.is_processing:
+                job.status = 'cancelled'
+            elif output_files:
+                with job.processor.metrics.time('zip') as result:
+                    job.zip_path = build_reports_zip(job.output_dir)
+                    result['bytes'] = os.path.getsize(job.zip_path)
+                if report_key and not job.processor.format_errors:
+                    get_report_cache().put(report_key, job.zip_path)
+                job.status = 'finished'
+            else:
+                job.status = 'failed'
+                job.error = "No output files generated"
         except Exception as e:
-            error_msg = f"Error processing {video_path}: {str(e)}"
-            self.log_message(error_msg, log_list)
-            raise
+            job.status = 'failed'
+            job.error = str(e)
+        finally:
+            job.processor.is_processing = False
+            job.finished_at = time.time()
+            shutil.rmtree(job.upload_dir, ignore_errors=True)
+            if job.status != 'finished':
+                shutil.rmtree(job.output_dir, ignore_errors=True)
+
+    def cancel(self, job):
+        with self.lock:
+            if job.status == 'queued':
+                job.future.cancel()
+                job.status = 'cancelled'
+                job.finished_at = time.time()
+                shutil.rmtree(job.upload_dir, ignore_errors=True)
+            elif job.status == 'running':
+                job.processor.is_processing = False
+
+    def start_pruner(self):
+        # Caller holds self.lock; started with the first job so importing app starts no threads
+        if self.pruner is None:
+            self.pruner = threading.Thread(target=self.prune_periodically, daemon=True)
+            self.pruner.start()
+
+    def prune_periodically(self):
+        # Expired results are removed even when no request arrives to trigger prune()
+        while True:
+            time.sleep(self.prune_interval)
+            self.prune()
+
+    def prune(self):
+        now = time.time()
+        with self.lock:
+            expired = [job for job in self.jobs.values()
+                       if job.finished_at and now - job.finished_at > self.result_ttl]
+            for job in expired:
+                del self.jobs[job.id]
+        for job in expired:
+            if job.output_dir:
+                shutil.rmtree(job.output_dir, ignore_errors=True)
+
+job_manager = JobManager(app.config['MAX_CONCURRENT_JOBS'], app.config['MAX_QUEUED_JOBS'], app.config['JOB_RESULT_TTL'],
+                         app.config['JOB_PRUNE_INTERVAL'])
+
+def _run_process_writer(writer_class, processor, writer_args, subtitles, cues, results):
+    # Worker side of ProcessReportWriter: None on the queue finishes the report, False aborts it
+    processor.metrics = StageMetrics()
+    processor.frame_cache = None
+    output_path, video_name, base_output_dir, relative_path = writer_args
+    log_list = []
+    writer = None
+    try:
+        writer = writer_class(processor, output_path, video_name, base_output_dir, log_list, relative_path)
+        writer.begin(subtitles)
+        while True:
+            item = cues.get()
+            if item is None:
+                results.put(('finished', writer.finish(), log_list))
+                return
+            if item is False:
+                writer.abort()
+                results.put(('aborted', None, log_list))
+                return
+            writer.add_cue(*item)
+    except Exception as e:
+        if writer is not None:
+            try:
+                writer.abort()
+            except Exception:
+                pass
+        results.put(('failed', str(e), log_list))
+
+def _render_pdf_chunk(html_path, pdf_path, pdf_css, base_url=None):
+    import weasyprint
+    html_doc = weasyprint.HTML(filename=html_path, base_url=base_url)
+    html_doc.write_pdf(pdf_path, stylesheets=[weasyprint.CSS(string=pdf_css)])
+    return pdf_path
 
 @app.route('/', methods=['GET', 'POST'])
 def index():
@@ -778,77 +2338,176 @@ def index():
         srt_file = request.files.get('srt_file')
         if not video_file or not srt_file:
             return "Please upload both video and SRT files", 400
+        formats = selected_formats(request.form)
+        if not formats:
+            return "Please select at least one export format", 400
 
-        # Save uploaded files
+        # Uploads were already streamed into a per-request directory while the form was parsed
+        video_path, video_hash = uploaded_file(video_file)
+        srt_path, srt_hash = uploaded_file(srt_file)
         video_filename = secure_filename(video_file.filename)
-        srt_filename = secure_filename(srt_file.filename)
-        video_path = os.path.join(app.config['UPLOAD_FOLDER'], video_filename)
-        srt_path = os.path.join(app.config['UPLOAD_FOLDER'], srt_filename)
-        video_file.save(video_path)
-        srt_file.save(srt_path)
-
-        # Get options from form
-        subtitles_per_page = int(request.form.get('subtitles_per_page', 3))
-        no_spacing = 'no_spacing' in request.form
-        narrow_borders = 'narrow_borders' in request.form
-        add_bookmarks = 'add_bookmarks' in request.form
-        heading_style = request.form.get('heading_style', 'numbered')
-        dark_theme = 'dark_theme' in request.form
-        text_color = request.form.get('text_color', '#000000')
-        label_color = request.form.get('label_color', '#FF0000')
-        page_organization = 'page_organization' in request.form
-        create_folder = 'create_folder' in request.form
-        use_video_name = 'use_video_name' in request.form
-        custom_title = request.form.get('custom_title', 'Video Subtitle Report')
-        if use_video_name:
-            custom_title = os.path.splitext(video_filename)[0]
-
-        # Create processor
-        processor = SubtitleProcessor(
-            subtitles_per_page=subtitles_per_page,
-            no_spacing=no_spacing,
-            narrow_borders=narrow_borders,
-            add_bookmarks=add_bookmarks,
-            heading_style=heading_style,
-            dark_theme=dark_theme,
-            text_color=text_color,
-            label_color=label_color,
-            page_organization=page_organization,
-            create_folder=create_folder,
-            custom_title=custom_title
-        )
-
-        # Temp output dir
-        output_dir = tempfile.mkdtemp()
+
+        try:
+            processor = processor_from_form(request.form, video_filename)
+        except ValueError as e:
+            return str(e), 400
+        video_hash, report_key, cached_zip = lookup_report_cache(processor, video_path, srt_path, formats,
+                                                                   video_hash, srt_hash)
+        if cached_zip:
+            return send_file(cached_zip, as_attachment=True, download_name='video_subtitle_reports.zip')
+
+        # Render in the job pool and stream each report into the zip response as it finishes
         processor.is_processing = True
         log_list = []
+        output_queue = queue.Queue()
+        output_dir = tempfile.mkdtemp()
 
-        try:
-            output_files = processor.process_video(video_path, srt_path, output_dir, log_list)
-            if output_files:
-                # Create zip
-                zip_path = os.path.join(output_dir, 'reports.zip')
-                with zipfile.ZipFile(zip_path, 'w') as zipf:
-                    for file_path in output_files:
-                        arcname = os.path.basename(file_path)
-                        zipf.write(file_path, arcname)
-                # Clean up individual files
-                for file_path in output_files:
-                    os.remove(file_path)
-                return send_file(zip_path, as_attachment=True, download_name='video_subtitle_reports.zip',
-                                 attachment_filename='video_subtitle_reports.zip')
-            else:
-                return "No output files generated", 400
-        except Exception as e:
-            return f"Processing error: {str(e)}", 500
-        finally:
+        def run():
+            try:
+                processor.process_video(video_path, srt_path, output_dir, log_list, formats, video_hash, output_queue.put)
+                output_queue.put(None)
+            except Exception as e:
+                output_queue.put(e)
+
+        worker = job_manager.submit_inline(run)
+        if worker is None:
+            shutil.rmtree(output_dir, ignore_errors=True)
+            return "Too many jobs in progress, please try again later", 503
+        first_path = output_queue.get()
+        if not isinstance(first_path, str):
+            worker.result()
             processor.is_processing = False
-            # Clean up uploads and temp dir
-            os.remove(video_path)
-            os.remove(srt_path)
             shutil.rmtree(output_dir, ignore_errors=True)
+            if isinstance(first_path, Exception):
+                return f"Processing error: {str(first_path)}", 500
+            return "No output files generated", 400
+
+        zip_path = os.path.join(output_dir, 'reports.zip') if report_key else None
+
+        def generate():
+            try:
+                with processor.metrics.time('zip') as result:
+                    for chunk in stream_reports_zip(output_queue, first_path, output_dir, zip_path):
+                        if chunk:
+                            result['bytes'] += len(chunk)
+                            yield chunk
+                worker.result()
+                if report_key and not processor.format_errors:
+                    get_report_cache().put(report_key, zip_path)
+            finally:
+                processor.is_processing = False
+                worker.result()
+                shutil.rmtree(output_dir, ignore_errors=True)
+
+        return Response(stream_with_context(generate()), mimetype='application/zip',
+                        headers={'Content-Disposition': 'attachment; filename=video_subtitle_reports.zip'})
 
     return render_template('index.html')
 
+@app.route('/cache', methods=['GET'])
+def cache_stats():
+    return jsonify({
+        'frames': get_frame_cache().stats() if get_frame_cache() else None,
+        'reports': get_report_cache().stats() if get_report_cache() else None,
+    })
+
+def prometheus_metrics():
+    lines = []
+
+    def metric(name, metric_type, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in samples:
+            label_text = ','.join(f'{key}="{val}"' for key, val in labels.items())
+            lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+    stages = stage_metrics.to_dict()['stages']
+    metric('subtitle_stage_seconds_total', 'counter', "Time spent in each processing stage",
+           [({'stage': stage}, entry['seconds']) for stage, entry in sorted(stages.items())])
+    metric('subtitle_stage_runs_total', 'counter', "Frames, cues or runs handled by each processing stage",
+           [({'stage': stage}, entry['count']) for stage, entry in sorted(stages.items())])
+    metric('subtitle_stage_bytes_total', 'counter', "Bytes read or produced by each processing stage",
+           [({'stage': stage}, entry['bytes']) for stage, entry in sorted(stages.items())])
+    metric('subtitle_stage_max_seconds', 'gauge', "Slowest single observation of each processing stage",
+           [({'stage': stage}, entry['max_seconds']) for stage, entry in sorted(stages.items())])
+    peak = peak_rss_bytes()
+    metric('subtitle_process_peak_rss_bytes', 'gauge', "Resident memory high-water mark of the server process",
+           [({}, peak)] if peak is not None else [])
+    with job_manager.lock:
+        statuses = [job.status for job in job_manager.jobs.values()]
+    metric('subtitle_jobs', 'gauge', "Tracked jobs by status",
+           [({'status': status}, statuses.count(status)) for status in ('queued', 'running', 'finished', 'failed', 'cancelled')])
+    for name, cache in (('frame', get_frame_cache()), ('report', get_report_cache())):
+        if cache is None:
+            continue
+        stats = cache.stats()
+        metric(f'subtitle_{name}_cache_hits_total', 'counter', f"{name.capitalize()} cache hits", [({}, stats['hits'])])
+        metric(f'subtitle_{name}_cache_misses_total', 'counter', f"{name.capitalize()} cache misses", [({}, stats['misses'])])
+        if 'bytes' in stats:
+            metric(f'subtitle_{name}_cache_bytes', 'gauge', f"{name.capitalize()} cache size on disk", [({}, stats['bytes'])])
+    return '\n'.join(lines) + '\n'
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return Response(prometheus_metrics(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    video_file = request.files.get('video_file')
+    srt_file = request.files.get('srt_file')
+    if not video_file or not srt_file:
+        return jsonify({'error': "Please upload both video and SRT files"}), 400
+    formats = selected_formats(request.form)
+    if not formats:
+        return jsonify({'error': "Please select at least one export format"}), 400
+
+    # Each request streams into its own upload directory, which the job takes ownership of
+    video_path, video_hash = uploaded_file(video_file)
+    srt_path, srt_hash = uploaded_file(srt_file)
+    video_filename = secure_filename(video_file.filename)
+
+    try:
+        processor = processor_from_form(request.form, video_filename)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    job = Job(processor, video_path, srt_path, formats, request.upload_dir, video_hash, srt_hash)
+    if job_manager.submit(job) is None:
+        return jsonify({'error': "Too many jobs in progress, please try again later"}), 503
+    request.keep_uploads = True
+    return jsonify({'id': job.id, 'status_url': f"/jobs/{job.id}"}), 202
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': "Unknown job"}), 404
+    return jsonify(job.to_dict(request.args.get('log_offset', 0, type=int)))
+
+@app.route('/jobs/<job_id>/timings', methods=['GET'])
+def job_timings(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': "Unknown job"}), 404
+    finished_at = job.finished_at or time.time()
+    return jsonify(dict(job.processor.metrics.to_dict(), id=job.id, status=job.status,
+                        wall_seconds=round(finished_at - job.created_at, 6)))
+
+@app.route('/jobs/<job_id>/download', methods=['GET'])
+def download_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': "Unknown job"}), 404
+    if job.status != 'finished':
+        return jsonify({'error': f"Job is {job.status}"}), 409
+    return send_file(job.zip_path, as_attachment=True, download_name='video_subtitle_reports.zip')
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': "Unknown job"}), 404
+    job_manager.cancel(job)
+    return jsonify(job.to_dict(len(job.log_list)))
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
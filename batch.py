@@ -0,0 +1,170 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from app import (EXPORT_FORMATS, THUMBNAIL_WIDTH, SubtitleProcessor, parse_cue_number, parse_ranges, parse_time_value,
+                 warm_backends)
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv')
+SUBTITLE_EXTENSIONS = ('.srt', '.vtt')
+
+
+def find_pairs(input_dir):
+    # Pairs each video with the SRT/VTT file of the same name next to it. Videos sharing a stem
+    # (lecture.mp4 and lecture.mkv) get the extension in their output name so neither overwrites the other
+    pairs = []
+    for root, dirs, files in os.walk(input_dir):
+        dirs.sort()
+        names = set(files)
+        videos = [file for file in sorted(files) if os.path.splitext(file)[1].lower() in VIDEO_EXTENSIONS]
+        stem_counts = Counter(os.path.splitext(file)[0] for file in videos)
+        for file in videos:
+            stem, extension = os.path.splitext(file)
+            subtitle = next((stem + ext for ext in SUBTITLE_EXTENSIONS + tuple(e.upper() for e in SUBTITLE_EXTENSIONS)
+                             if stem + ext in names), None)
+            relative_path = os.path.relpath(root, input_dir)
+            pairs.append({
+                'video': os.path.join(root, file),
+                'srt': os.path.join(root, subtitle) if subtitle else None,
+                'relative_path': '' if relative_path == '.' else relative_path,
+                'key': os.path.relpath(os.path.join(root, file), input_dir),
+                'output_name': f"{stem}_{extension[1:].lower()}" if stem_counts[stem] > 1 else None,
+            })
+    return pairs
+
+
+def load_state(state_path):
+    # The state file is JSON lines, one per finished video; the last line for a key wins
+    state = {}
+    if os.path.exists(state_path):
+        with open(state_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by an interrupted run
+                state[entry['key']] = entry
+    return state
+
+
+def process_pair(options, pair, output_dir, formats):
+    processor = SubtitleProcessor(**options)
+    if options.get('custom_title') is None:
+        processor.custom_title = os.path.splitext(os.path.basename(pair['video']))[0]
+    processor.is_processing = True
+    log_list = []
+    started = time.time()
+    output_files = processor.process_video(pair['video'], pair['srt'], output_dir, log_list, formats,
+                                           relative_path=pair['relative_path'], output_name=pair['output_name'])
+    return {
+        'outputs': [os.path.relpath(path, output_dir) for path in output_files],
+        'format_errors': processor.format_errors,
+        'seconds': round(time.time() - started, 2),
+    }, log_list
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-process a directory tree of video + SRT/VTT pairs")
+    parser.add_argument('input_dir')
+    parser.add_argument('output_dir')
+    parser.add_argument('--formats', default='docx', help=f"comma separated, any of {','.join(EXPORT_FORMATS)}")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="videos processed in parallel")
+    parser.add_argument('--state', default=None, help="progress file, defaults to OUTPUT_DIR/batch_state.jsonl")
+    parser.add_argument('--retry-failed', action='store_true', help="reprocess videos that failed in an earlier run")
+    parser.add_argument('--verbose', action='store_true', help="print each video's processing log")
+    parser.add_argument('--title', default=None, help="document title, defaults to each video's file name")
+    parser.add_argument('--subtitles-per-page', type=int, default=3)
+    parser.add_argument('--heading-style', choices=['numbered', 'simple', 'time'], default='numbered')
+    parser.add_argument('--dark-theme', action='store_true')
+    parser.add_argument('--no-folder', action='store_true', help="write reports without a per-video output folder")
+    parser.add_argument('--image-width', type=int, default=0)
+    parser.add_argument('--image-format', choices=['png', 'jpeg', 'webp'], default='png')
+    parser.add_argument('--image-quality', type=int, default=85)
+    parser.add_argument('--thumbnails', action='store_true')
+    parser.add_argument('--dedup-similarity', type=float, default=0.0)
+    parser.add_argument('--fast-docx', action='store_true', help="stream DOCX files with predefined styles")
+    parser.add_argument('--html-paged', action='store_true', help="split HTML into linked pages with thumbnails")
+    parser.add_argument('--html-cues-per-file', type=int, default=0, help="subtitles per HTML page, 0 uses --subtitles-per-page")
+    parser.add_argument('--time-ranges', default='', help="only export cues shown in these windows, e.g. 12:00-15:30,3600-")
+    parser.add_argument('--cue-ranges', default='', help="only export these subtitle numbers, e.g. 1-40,75,120-")
+    args = parser.parse_args()
+
+    formats = [format_name for format_name in args.formats.split(',') if format_name]
+    unknown = [format_name for format_name in formats if format_name not in EXPORT_FORMATS]
+    if unknown or not formats:
+        parser.error(f"unknown export format: {','.join(unknown) or args.formats}")
+    try:
+        time_ranges = parse_ranges(args.time_ranges, parse_time_value)
+        cue_ranges = parse_ranges(args.cue_ranges, parse_cue_number)
+    except ValueError as e:
+        parser.error(str(e))
+    options = {
+        'subtitles_per_page': args.subtitles_per_page,
+        'heading_style': args.heading_style,
+        'dark_theme': args.dark_theme,
+        'create_folder': not args.no_folder,
+        'custom_title': args.title,
+        'image_width': args.image_width,
+        'image_format': args.image_format,
+        'image_quality': args.image_quality,
+        'thumbnail_width': THUMBNAIL_WIDTH if args.thumbnails or args.html_paged else 0,
+        'dedup_similarity': args.dedup_similarity,
+        'fast_docx': args.fast_docx,
+        'html_paged': args.html_paged,
+        'html_cues_per_file': args.html_cues_per_file,
+        'time_ranges': time_ranges,
+        'cue_ranges': cue_ranges,
+    }
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    state_path = args.state or os.path.join(args.output_dir, 'batch_state.jsonl')
+    state = load_state(state_path)
+    pairs = find_pairs(args.input_dir)
+    for pair in pairs:
+        if pair['srt'] is None:
+            print(f"Skipping {pair['key']}: no matching SRT/VTT file")
+        elif pair['output_name']:
+            print(f"{pair['key']} shares its name with another video, writing it as {pair['output_name']}")
+    done_statuses = ('done',) if args.retry_failed else ('done', 'failed')
+    pending = [pair for pair in pairs if pair['srt'] and state.get(pair['key'], {}).get('status') not in done_statuses]
+    print(f"{len(pairs)} videos found, {len(pending)} to process, state in {state_path}")
+
+    # Import the writers once here so forked workers inherit them instead of each importing them
+    try:
+        warm_backends(['capture'] + formats)
+    except Exception as e:
+        print(f"Could not preload every backend, workers will retry and report it per format: {e}")
+    failed = 0
+    with open(state_path, 'a', encoding='utf-8') as state_file, \
+            ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = {pool.submit(process_pair, options, pair, args.output_dir, formats): pair for pair in pending}
+        try:
+            for completed, future in enumerate(as_completed(futures), 1):
+                pair = futures[future]
+                entry = {'key': pair['key'], 'finished_at': time.time()}
+                try:
+                    result, log_list = future.result()
+                    entry.update(result, status='done' if result['outputs'] else 'failed')
+                except Exception as e:
+                    log_list = []
+                    entry.update(status='failed', error=str(e))
+                failed += entry['status'] == 'failed'
+                state_file.write(json.dumps(entry) + '\n')
+                state_file.flush()
+                if args.verbose:
+                    print('\n'.join(log_list))
+                print(f"[{completed}/{len(pending)}] {pair['key']}: {entry['status']}"
+                      + (f" ({entry['error']})" if 'error' in entry else ''))
+        except KeyboardInterrupt:
+            pool.shutdown(cancel_futures=True)
+            print("Interrupted, rerun the same command to resume")
+            return 130
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
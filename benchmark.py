@@ -0,0 +1,300 @@
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import cv2
+import numpy as np
+
+from app import BACKEND_MODULES, EXPORT_FORMATS, ImageAssetStore, SubtitleProcessor
+
+
+def make_synthetic_video(path, duration=60, fps=25, width=1280, height=720):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    for i in range(int(duration * fps)):
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        frame[:, :, 0] = (i * 3) % 256
+        frame[:, :, 1] = (i // 7) % 256
+        cv2.putText(frame, f"frame {i}", (40, height // 2), cv2.FONT_HERSHEY_SIMPLEX, 3, (255, 255, 255), 5)
+        writer.write(frame)
+    writer.release()
+
+
+def make_timestamps(count, duration):
+    step = duration / (count + 1)
+    return [step * (i + 1) for i in range(count)]
+
+
+def format_srt_time(seconds):
+    millis = int(round(seconds * 1000))
+    return f"{millis // 3600000:02d}:{millis // 60000 % 60:02d}:{millis // 1000 % 60:02d},{millis % 1000:03d}"
+
+
+def make_synthetic_srt(path, count, cue_seconds=2.0):
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            start, end = i * cue_seconds, (i + 1) * cue_seconds - 0.1
+            f.write(f"{i + 1}\n{format_srt_time(start)} --> {format_srt_time(end)}\n"
+                    f"Synthetic subtitle line {i + 1}\nsecond line of cue {i + 1}\n\n")
+
+
+def legacy_parse_srt_time(time_str):
+    time_str = time_str.replace(',', '.')
+    h, m, s = time_str.split(':')
+    return int(h) * 3600 + int(m) * 60 + float(s)
+
+
+def legacy_parse_srt(srt_path):
+    # The regex-split parser parse_srt_file used before the streaming parser, kept verbatim here
+    subtitles = []
+    with open(srt_path, 'r', encoding='utf-8') as file:
+        content = file.read()
+    for block in re.split(r'\n\s*\n', content.strip()):
+        lines = block.strip().split('\n')
+        if len(lines) >= 3:
+            start_time, end_time = lines[1].strip().split(' --> ')
+            subtitles.append({
+                'number': lines[0].strip(),
+                'start_time': legacy_parse_srt_time(start_time),
+                'end_time': legacy_parse_srt_time(end_time),
+                'text': '\n'.join(lines[2:])
+            })
+    return subtitles
+
+
+def frame_digests(frames):
+    return [hashlib.sha1(frame.tobytes()).hexdigest() if frame is not None else None for frame in frames]
+
+
+def maxrss_mb(maxrss):
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    return maxrss / (1024 * 1024) if sys.platform == 'darwin' else maxrss / 1024
+
+
+def peak_rss_mb():
+    # Children covers capture/render worker processes; None where the resource module is missing
+    if resource is None:
+        return None
+    return maxrss_mb(max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                         resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss))
+
+
+def _measured(func, args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, peak_rss_mb(), result
+
+
+def measure(func, *args):
+    # Runs one stage in a fresh process so its peak RSS is not inherited from earlier stages
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(_measured, func, args).result()
+
+
+def capture_loop(video_path, timestamps):
+    processor = SubtitleProcessor()
+    processor.is_processing = True
+    return frame_digests([processor.capture_screenshot(video_path, t, []) for t in timestamps])
+
+
+def capture_batched(video_path, timestamps, workers, shard_seconds):
+    processor = SubtitleProcessor(capture_workers=workers, shard_seconds=shard_seconds)
+    processor.is_processing = True
+    return frame_digests(processor.capture_screenshots(video_path, timestamps, []))
+
+
+def parse_legacy(srt_path):
+    return [(cue['number'], cue['start_time'], cue['end_time'], cue['text'])
+            for cue in legacy_parse_srt(srt_path)]
+
+
+def parse_streaming(srt_path):
+    return [(cue.number, cue.start_time, cue.end_time, cue.text)
+            for cue in SubtitleProcessor().parse_srt_file(srt_path, [])]
+
+
+def render_report(format_name, subtitles, screenshots, output_dir, options):
+    processor = SubtitleProcessor(**options)
+    processor.is_processing = True
+    output_path = os.path.join(output_dir, f"synthetic_subtitles.{format_name}")
+    output_path = processor.render_format(format_name, subtitles, screenshots, output_path, 'synthetic', output_dir, [])
+    return os.path.getsize(output_path)
+
+
+def record(suite, name, seconds, rss, items, unit, **extra):
+    return dict({'suite': suite, 'name': name, 'seconds': round(seconds, 4), 'items': items, 'unit': unit,
+                 'rate': round(items / seconds, 2) if seconds else None,
+                 'peak_rss_mb': round(rss, 1) if rss is not None else None}, **extra)
+
+
+def bench_capture(video_path, timestamps, workers, shard_seconds):
+    results = []
+    seconds, rss, baseline = measure(capture_loop, video_path, timestamps)
+    results.append(record('capture', 'serial capture_screenshot loop', seconds, rss, len(timestamps), 'frames'))
+    for name, capture_workers in (('single-pass capture_screenshots', 1), (f'parallel capture ({workers} workers)', workers)):
+        seconds, rss, digests = measure(capture_batched, video_path, timestamps, capture_workers, shard_seconds)
+        mismatched = sum(1 for a, b in zip(baseline, digests) if a is None or a != b)
+        results.append(record('capture', name, seconds, rss, len(timestamps), 'frames', mismatched=mismatched))
+    return results
+
+
+def bench_srt_parse(srt_path):
+    results = []
+    seconds, rss, legacy = measure(parse_legacy, srt_path)
+    results.append(record('srt', 'regex-split parser', seconds, rss, len(legacy), 'cues'))
+    seconds, rss, streamed = measure(parse_streaming, srt_path)
+    mismatched = sum(1 for a, b in zip(legacy, streamed) if a != b) + abs(len(legacy) - len(streamed))
+    results.append(record('srt', 'streaming parse_srt_file', seconds, rss, len(streamed), 'cues',
+                          mismatched=mismatched, input_bytes=os.path.getsize(srt_path)))
+    return results
+
+
+def bench_render(video_path, srt_path, formats, work_dir, options):
+    # Captures once up front, then times each writer on its own over the same screenshots
+    processor = SubtitleProcessor(**options)
+    processor.is_processing = True
+    subtitles = processor.parse_srt_file(srt_path, [])
+    store = ImageAssetStore(os.path.join(work_dir, 'images'))
+    screenshots = processor.store_screenshots(video_path, [cue.end_time for cue in subtitles], store, [])
+    results = []
+    for format_name in formats:
+        output_dir = os.path.join(work_dir, format_name)
+        os.makedirs(output_dir)
+        seconds, rss, output_bytes = measure(render_report, format_name, subtitles, screenshots, output_dir, options)
+        results.append(record('render', f'create {format_name} report', seconds, rss, len(subtitles), 'cues',
+                              output_bytes=output_bytes))
+    return results
+
+
+CHILD_MAXRSS_CODE = ("try:\n    import resource\nexcept ImportError:\n    print(-1)\n"
+                     "else:\n    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)")
+IMPORTTIME_RE = re.compile(r'^import time:\s*\d+ \|\s*(\d+) \| (\S+)$')  # top-level imports only
+
+
+def import_time(code):
+    # Sums the cumulative microseconds of top-level imports reported by `python -X importtime`
+    # for CODE; the child prints its own peak RSS so the memory cost is reported too
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                             f"{code}\n{CHILD_MAXRSS_CODE}"],
+                            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    micros = sum(int(match.group(1)) for match in map(IMPORTTIME_RE.match, result.stderr.splitlines()) if match)
+    maxrss = int(result.stdout.split()[-1])
+    return micros / 1e6, maxrss_mb(maxrss) if maxrss >= 0 else None
+
+
+def bench_imports(runs):
+    # Startup cost of `import app` with lazy backends against importing each backend up front;
+    # the interpreter's own startup imports are measured separately and subtracted
+    def best(code):
+        return min((import_time(code) for _ in range(runs)), key=lambda result: result[0])
+
+    startup, _ = best('pass')
+    results = []
+    cases = [('import app (lazy backends)', 'import app')]
+    cases += [(f'import app + {name} backend', f"import app; app.warm_backends(['{name}'])") for name in BACKEND_MODULES]
+    cases.append(('import app + all backends (eager)', 'import app; app.warm_backends()'))
+    for name, code in cases:
+        try:
+            seconds, rss = best(code)
+        except RuntimeError as e:
+            print(f"  skipped {name}: {e}")
+            continue
+        results.append(record('import', name, seconds - startup, rss, 1, 'imports'))
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Capture, SRT parsing and report writer benchmarks on synthetic fixtures")
+    parser.add_argument('suite', nargs='?', choices=['all', 'capture', 'srt', 'render', 'import'], default='all')
+    parser.add_argument('--duration', type=float, default=120, help="video length in seconds")
+    parser.add_argument('--fps', type=int, default=25)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--cues', type=int, default=200, help="number of subtitle end_time targets")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--shard-seconds', type=float, default=None)
+    parser.add_argument('--srt-cues', type=int, default=100000, help="number of cues in the synthetic SRT")
+    parser.add_argument('--formats', default=','.join(EXPORT_FORMATS), help="writers timed by the render suite")
+    parser.add_argument('--image-format', choices=['png', 'jpeg', 'webp'], default='png')
+    parser.add_argument('--image-width', type=int, default=0)
+    parser.add_argument('--import-runs', type=int, default=5, help="fastest of N interpreter starts per import case")
+    parser.add_argument('--json', metavar='PATH', help="write machine-readable results to PATH, '-' for stdout")
+    args = parser.parse_args()
+
+    results = []
+    temp_dir = tempfile.mkdtemp()
+    try:
+        if args.suite in ('all', 'capture', 'render'):
+            video_path = os.path.join(temp_dir, 'synthetic.mp4')
+            make_synthetic_video(video_path, args.duration, args.fps, args.width, args.height)
+        if args.suite in ('all', 'capture'):
+            timestamps = make_timestamps(args.cues, args.duration)
+            results += bench_capture(video_path, timestamps, args.workers, args.shard_seconds)
+        if args.suite in ('all', 'srt'):
+            srt_path = os.path.join(temp_dir, 'synthetic.srt')
+            make_synthetic_srt(srt_path, args.srt_cues)
+            results += bench_srt_parse(srt_path)
+        if args.suite in ('all', 'render'):
+            render_srt_path = os.path.join(temp_dir, 'render.srt')
+            make_synthetic_srt(render_srt_path, args.cues, args.duration / args.cues)
+            options = {'image_format': args.image_format, 'image_width': args.image_width}
+            formats = [format_name for format_name in args.formats.split(',') if format_name in EXPORT_FORMATS]
+            results += bench_render(video_path, render_srt_path, formats, os.path.join(temp_dir, 'render'), options)
+        if args.suite in ('all', 'import'):
+            results += bench_imports(args.import_runs)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    if args.json:
+        report = {
+            'revision': git_revision(),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'params': vars(args),
+            'results': results,
+        }
+        if args.json == '-':
+            json.dump(report, sys.stdout, indent=2)
+            print()
+            return
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    print(f"video {args.duration:.0f}s of {args.width}x{args.height}@{args.fps}fps, {args.cues} cues, "
+          f"{args.srt_cues} cue SRT")
+    for result in results:
+        size = f"  {result['output_bytes'] / 1024:10.1f} KiB" if 'output_bytes' in result else ''
+        print(f"  {result['suite']:8s} {result['name']:40s} {result['seconds']:8.2f}s "
+              f"{result['rate']:10.1f} {result['unit']}/s  {result['peak_rss_mb'] or 0:7.1f} MiB peak{size}")
+        if result.get('mismatched'):
+            print(f"  WARNING: {result['mismatched']} {result['unit']} differ from the baseline")
+
+
+if __name__ == '__main__':
+    main()
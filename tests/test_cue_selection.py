@@ -0,0 +1,127 @@
+import io
+
+import pytest
+
+from app import Cue, CueIndex, app, parse_cue_number, parse_ranges, parse_time_value
+
+
+def cues(*timings):
+    return [Cue(str(number), start, end, f"cue {number}") for number, (start, end) in enumerate(timings, 1)]
+
+
+def numbers(selected):
+    return [cue.number for cue in selected]
+
+
+@pytest.mark.parametrize('text, seconds', [
+    ('90', 90.0),
+    ('1.5', 1.5),
+    ('01:30', 90.0),
+    ('1:02:03', 3723.0),
+    ('00:00:01,250', 1.25),
+    (' 00:01:00.5 ', 60.5),
+])
+def test_parse_time_value(text, seconds):
+    assert parse_time_value(text) == seconds
+
+
+@pytest.mark.parametrize('text', ['1:2:3:4', '1::2', 'abc', 'nan', ''])
+def test_parse_time_value_rejects(text):
+    with pytest.raises(ValueError):
+        parse_time_value(text)
+
+
+def test_parse_time_ranges():
+    assert parse_ranges("00:01:00-00:03:30, 12:00-12:45; 90-120", parse_time_value) == \
+        [(60.0, 210.0), (720.0, 765.0), (90.0, 120.0)]
+
+
+def test_parse_open_and_single_ranges():
+    assert parse_ranges("3600-", parse_time_value) == [(3600.0, None)]
+    assert parse_ranges("-1:00", parse_time_value) == [(None, 60.0)]
+    assert parse_ranges("1-20, 45, 60-", parse_cue_number) == [(1, 20), (45, 45), (60, None)]
+
+
+@pytest.mark.parametrize('text', [None, '', ' , ;'])
+def test_parse_empty_ranges(text):
+    assert parse_ranges(text, parse_time_value) == []
+
+
+@pytest.mark.parametrize('text, message', [
+    ('5-2', "Invalid range: 5-2 ends before it starts"),
+    ('12:00-11:00', "Invalid range: 12:00-11:00 ends before it starts"),
+    ('x-1', "Invalid range: x-1"),
+    ('1-2-3', "Invalid range: 1-2-3"),
+    ('1:2:3:4', "Invalid range: 1:2:3:4"),
+])
+def test_parse_invalid_time_ranges(text, message):
+    with pytest.raises(ValueError) as error:
+        parse_ranges(text, parse_time_value)
+    assert str(error.value) == message
+
+
+def test_parse_invalid_cue_ranges():
+    with pytest.raises(ValueError, match="Invalid range: 1.5"):
+        parse_ranges("1.5", parse_cue_number)
+
+
+def test_window_includes_cues_spanning_its_edges():
+    index = CueIndex(cues((0, 10), (8, 12), (12, 20), (19, 30), (30, 40)))
+    assert numbers(index.select([(11, 19)])) == ['2', '3', '4']
+
+
+def test_window_edges_are_exclusive_for_ending_cues():
+    # A cue that ends exactly when the window starts is not shown in it; one starting at its end is
+    index = CueIndex(cues((0, 5), (5, 10), (10, 15)))
+    assert numbers(index.select([(5, 10)])) == ['2', '3']
+
+
+def test_long_cue_found_through_running_max_end():
+    index = CueIndex(cues((0, 100), (1, 2), (3, 4), (50, 51)))
+    assert numbers(index.select([(60, 70)])) == ['1']
+
+
+def test_open_ended_windows():
+    index = CueIndex(cues((0, 10), (3590, 3605), (3700, 3710)))
+    assert numbers(index.select([(3600, None)])) == ['2', '3']
+    assert numbers(index.select([(None, 5)])) == ['1']
+    assert numbers(index.select([(None, None)])) == ['1', '2', '3']
+
+
+def test_overlapping_ranges_keep_file_order_without_duplicates():
+    index = CueIndex(cues((0, 1), (1, 2), (2, 3), (3, 4)))
+    assert numbers(index.select([(2.5, 4), (0, 2.5)], [(2, 3)])) == ['1', '2', '3', '4']
+
+
+def test_unsorted_cues_are_returned_in_file_order():
+    index = CueIndex([Cue('1', 30, 31, 'c'), Cue('2', 10, 11, 'a'), Cue('3', 20, 21, 'b')])
+    assert numbers(index.select([(0, 25)])) == ['2', '3']
+
+
+def test_cue_number_ranges():
+    index = CueIndex(cues(*[(i, i + 1) for i in range(10)]))
+    assert numbers(index.select(cue_ranges=[(3, 5), (9, None)])) == ['3', '4', '5', '9', '10']
+    assert numbers(index.select(cue_ranges=[(None, 2)])) == ['1', '2']
+    assert numbers(index.select(cue_ranges=[(11, None)])) == []
+
+
+def test_cue_number_ranges_skip_non_numeric_ids():
+    index = CueIndex([Cue('intro', 0, 1, 'a'), Cue('2', 1, 2, 'b')])
+    assert numbers(index.select(cue_ranges=[(None, None)])) == ['2']
+
+
+def test_empty_index():
+    assert CueIndex([]).select([(0, None)], [(1, None)]) == []
+
+
+@pytest.mark.parametrize('url', ['/', '/jobs'])
+def test_invalid_range_is_rejected_with_400(url):
+    client = app.test_client()
+    response = client.post(url, content_type='multipart/form-data', data={
+        'export_md': 'true',
+        'cue_ranges': '5-2',
+        'video_file': (io.BytesIO(b'video'), 'v.mp4'),
+        'srt_file': (io.BytesIO(b'1\n00:00:00,000 --> 00:00:01,000\nhi\n'), 's.srt'),
+    })
+    assert response.status_code == 400
+    assert b"Invalid range: 5-2 ends before it starts" in response.data
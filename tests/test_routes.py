@@ -0,0 +1,16 @@
+import io
+
+import pytest
+
+from app import app
+
+
+@pytest.mark.parametrize('url', ['/', '/jobs'])
+def test_missing_export_format_is_rejected_with_400(url):
+    client = app.test_client()
+    response = client.post(url, content_type='multipart/form-data', data={
+        'video_file': (io.BytesIO(b'video'), 'v.mp4'),
+        'srt_file': (io.BytesIO(b'1\n00:00:00,000 --> 00:00:01,000\nhi\n'), 's.srt'),
+    })
+    assert response.status_code == 400
+    assert b"Please select at least one export format" in response.data
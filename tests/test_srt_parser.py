@@ -0,0 +1,106 @@
+import pytest
+
+from app import SubtitleProcessor
+
+
+@pytest.fixture
+def parse(tmp_path):
+    def parse(content, newline='\n', encoding='utf-8'):
+        path = tmp_path / 'subtitles.srt'
+        path.write_bytes(content.replace('\n', newline).encode(encoding))
+        log_list = []
+        cues = list(SubtitleProcessor().iter_srt_file(str(path), log_list))
+        return [(cue.number, cue.start_time, cue.end_time, cue.text) for cue in cues], log_list
+    return parse
+
+
+SRT = """1
+00:00:01,000 --> 00:00:02,500
+First line
+second line
+
+2
+00:01:00,250 --> 01:00:00,000
+Second cue
+"""
+
+
+def test_srt(parse):
+    cues, log_list = parse(SRT)
+    assert cues == [('1', 1.0, 2.5, 'First line\nsecond line'), ('2', 60.25, 3600.0, 'Second cue')]
+    assert log_list == []
+
+
+def test_crlf_and_bom(parse):
+    assert parse(SRT, newline='\r\n', encoding='utf-8-sig')[0] == parse(SRT)[0]
+
+
+def test_last_block_without_trailing_blank_line(parse):
+    cues, _ = parse("1\n00:00:01,000 --> 00:00:02,000\nno newline at the end")
+    assert cues == [('1', 1.0, 2.0, 'no newline at the end')]
+
+
+def test_extra_blank_lines_between_blocks(parse):
+    cues, _ = parse("\n\n1\n00:00:01,000 --> 00:00:02,000\na\n\n\n\n2\n00:00:03,000 --> 00:00:04,000\nb\n\n")
+    assert [cue[0] for cue in cues] == ['1', '2']
+
+
+def test_webvtt_header_notes_and_styles_are_skipped(parse):
+    cues, log_list = parse("""WEBVTT - lecture
+
+NOTE written by hand
+spans two lines
+
+STYLE
+::cue { color: yellow; }
+
+00:01.000 --> 00:02.500
+Hour-less timing
+
+intro
+00:00:03.000 --> 00:00:04.000
+With a cue ID
+""")
+    assert cues == [('1', 1.0, 2.5, 'Hour-less timing'), ('intro', 3.0, 4.0, 'With a cue ID')]
+    assert log_list == []
+
+
+def test_cues_without_ids_are_numbered_in_order(parse):
+    cues, _ = parse("WEBVTT\n\n00:00:01.000 --> 00:00:02.000\na\n\n00:00:03.000 --> 00:00:04.000\nb\n")
+    assert [cue[0] for cue in cues] == ['1', '2']
+
+
+def test_timing_attributes_are_ignored(parse):
+    cues, _ = parse("WEBVTT\n\n1\n00:00:01.000 --> 00:00:02.000 align:start position:10%\ntext\n")
+    assert cues == [('1', 1.0, 2.0, 'text')]
+
+
+def test_malformed_blocks_are_logged_and_skipped(parse):
+    cues, log_list = parse("""1
+00:00:01,000 -> 00:00:02,000
+bad arrow
+
+2
+not a timing line
+
+3
+00:00:05,000 --> 00:00:06,000
+good
+""")
+    assert cues == [('3', 5.0, 6.0, 'good')]
+    assert len(log_list) == 2
+    assert "Skipping malformed subtitle block at line 1" in log_list[0]
+    assert "Skipping malformed subtitle block at line 5" in log_list[1]
+
+
+def test_cue_without_text(parse):
+    cues, _ = parse("1\n00:00:01,000 --> 00:00:02,000\n\n2\n00:00:03,000 --> 00:00:04,000\nb\n")
+    assert cues == [('1', 1.0, 2.0, ''), ('2', 3.0, 4.0, 'b')]
+
+
+def test_parse_srt_file_logs_the_count(parse, tmp_path):
+    path = tmp_path / 'subtitles.srt'
+    path.write_text(SRT, encoding='utf-8')
+    log_list = []
+    assert len(SubtitleProcessor().parse_srt_file(str(path), log_list)) == 2
+    assert "Parsed 2 subtitles" in log_list[-1]